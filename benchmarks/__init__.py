@@ -0,0 +1,3 @@
+"""Benchmarks for the core operations of playgroundtools.
+
+Run them from the repository root with 'python -m benchmarks'."""
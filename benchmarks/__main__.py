@@ -0,0 +1,48 @@
+"""Run the benchmarks, optionally saving and comparing their results."""
+import os
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+from playgroundtools.util import DATA_DIR_ENV
+
+from . import bench_commands, bench_config  # noqa: F401 (registers them)
+from .runner import compare_results, run_benchmarks, write_results
+
+
+def main():
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k",
+        "--pattern",
+        default="*",
+        help="Only run benchmarks with names matching a glob pattern.",
+    )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply the number of repetitions of each benchmark.",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Save the results to a file (in JSON)."
+    )
+    parser.add_argument(
+        "-c", "--compare", help="Compare the results with a previous run."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the package's data and configuration out of the way
+        os.environ[DATA_DIR_ENV] = os.path.join(tmp_dir, "data")
+        results = run_benchmarks(Path(tmp_dir), args.pattern, args.scale)
+
+    if args.output:
+        write_results(args.output, results)
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
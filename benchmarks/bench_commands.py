@@ -0,0 +1,65 @@
+"""Benchmarks for creating and deleting playgrounds, and starting the CLI."""
+import subprocess
+import sys
+from argparse import Namespace
+from itertools import count
+from pathlib import Path
+
+from playgroundtools import commands
+from playgroundtools.venvs import get_template
+
+from .bench_config import use_config
+from .runner import Case, benchmark
+from .synthetic import make_tree
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+@benchmark(repeat=5)
+def bench_new(bench_dir):
+    """Create playgrounds from a cloned environment, without running pip."""
+    use_config(bench_dir)
+    get_template()
+    names = count()
+
+    def new():
+        args = Namespace(
+            command="new",
+            name=str(bench_dir / f"playground{next(names)}"),
+            type="type0",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        install_reqs = commands.install_reqs
+        commands.install_reqs = lambda *args: None
+        try:
+            commands.new(args)
+        finally:
+            commands.install_reqs = install_reqs
+
+    return Case(new)
+
+
+@benchmark(repeat=3)
+def bench_delete(bench_dir):
+    """Delete a playground with 10,000 files and wait for its removal."""
+    playground_dir = bench_dir / "playground"
+    args = Namespace(command="delete", name=str(playground_dir), wait=True)
+
+    def setup():
+        make_tree(playground_dir)
+        (playground_dir / "settings.json").write_text("{}")
+
+    return Case(lambda: commands.delete(args), setup=setup)
+
+
+@benchmark(repeat=10)
+def bench_cli_startup(bench_dir):
+    """Start the CLI in a new interpreter."""
+    argv = [sys.executable, "-m", "playgroundtools"]
+    return Case(
+        lambda: subprocess.run(
+            argv, cwd=ROOT_DIR, stdout=subprocess.DEVNULL, check=True
+        )
+    )
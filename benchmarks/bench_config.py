@@ -0,0 +1,89 @@
+"""Benchmarks for reading, formatting and modifying the configuration."""
+import json
+import os
+import time
+from argparse import Namespace
+
+from playgroundtools import commands
+from playgroundtools.configdir import write_config_dir
+from playgroundtools.playground import (
+    CONFIG_ENV,
+    clean_config,
+    get_config,
+    get_config_cache_path,
+)
+from playgroundtools.util import format_dict
+
+from .runner import Case, benchmark
+from .synthetic import make_config, make_type, write_config
+
+
+def use_config(bench_dir):
+    """Point the package at a new synthetic configuration.
+
+    The file is backdated, as a freshly written configuration is always read
+    again in case it is modified within the same instant it is cached."""
+    config_path = bench_dir / "config.json"
+    write_config(config_path)
+    modified = time.time() - 60
+    os.utime(config_path, (modified, modified))
+    os.environ[CONFIG_ENV] = str(config_path)
+    return config_path
+
+
+@benchmark(repeat=10)
+def bench_get_config(bench_dir):
+    use_config(bench_dir)
+    get_config()
+    return Case(get_config)
+
+
+@benchmark(repeat=5)
+def bench_get_config_uncached(bench_dir):
+    use_config(bench_dir)
+    return Case(get_config, setup=get_config_cache_path().unlink)
+
+
+@benchmark(repeat=10)
+def bench_get_config_type_split(bench_dir):
+    """Read one type from a configuration directory."""
+    config_dir = bench_dir / "config"
+    write_config_dir(make_config(), config_dir)
+    os.environ[CONFIG_ENV] = str(config_dir)
+    return Case(lambda: get_config()["type0"])
+
+
+@benchmark(repeat=10)
+def bench_clean_config_new(bench_dir):
+    use_config(bench_dir)
+    raw_config = get_config()
+    args = Namespace(
+        command="new",
+        name=str(bench_dir / "playground"),
+        type="type0",
+        lib=["extra==${version}"],
+        verbose=0,
+        options=json.dumps({"author": "Someone"}),
+    )
+    return Case(lambda: clean_config(args, raw_config))
+
+
+@benchmark(repeat=10)
+def bench_format_dict(bench_dir):
+    unformatted = make_type()
+    format_map = {"name": "playground", "author": "Someone", "version": "2"}
+    return Case(lambda: format_dict(unformatted, format_map))
+
+
+@benchmark(repeat=5)
+def bench_config_set(bench_dir):
+    use_config(bench_dir)
+    args = Namespace(
+        command="config",
+        subcommand="set",
+        key="type0.module",
+        value='"main"',
+        file=None,
+        read=None,
+    )
+    return Case(lambda: commands.config(args))
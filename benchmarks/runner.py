@@ -0,0 +1,130 @@
+"""Module to register, time and record benchmarks.
+
+Benchmarks are timed with time.perf_counter in the manner of timeit: each
+is run 'number' times per repetition and the mean of each repetition is
+recorded. Results are stored as JSON so they can be compared between
+commits."""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from contextlib import redirect_stdout
+from fnmatch import fnmatch
+from statistics import mean, median
+
+BENCHMARKS = {}
+
+# A benchmark's function to time, with an optional untimed setup function
+# run before each repetition
+Case = namedtuple("Case", ["run", "setup"], defaults=[None])
+
+
+def benchmark(repeat=5, number=1):
+    """Register a benchmark.
+
+    The decorated function receives a temporary directory to work in and
+    returns the Case to time."""
+
+    def register(func):
+        name = func.__name__.removeprefix("bench_")
+        BENCHMARKS[name] = (func, repeat, number)
+        return func
+
+    return register
+
+
+def time_case(case, repeat, number):
+    """Returns the mean time of a call to a case in each repetition.
+
+    Anything the case prints is discarded."""
+    times = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            if case.setup:
+                case.setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                case.run()
+            times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def run_benchmarks(tmp_dir, pattern="*", scale=1.0):
+    """Run the benchmarks with names matching 'pattern'.
+
+    The number of repetitions of each benchmark is multiplied by 'scale'. A
+    dictionary mapping the names of benchmarks to their results is
+    returned."""
+    results = {}
+    for name, (func, repeat, number) in BENCHMARKS.items():
+        if not fnmatch(name, pattern):
+            continue
+        bench_dir = tmp_dir / name
+        bench_dir.mkdir()
+        case = func(bench_dir)
+        repeat = max(1, round(repeat * scale))
+        times = time_case(case, repeat, number)
+        results[name] = {
+            "min": min(times),
+            "median": median(times),
+            "mean": mean(times),
+            "max": max(times),
+            "repeat": repeat,
+            "number": number,
+            "times": times,
+        }
+        print(f"{name:<24} {format_time(results[name]['median'])}")
+    return results
+
+
+def get_commit():
+    """Returns the current git commit, if there is one."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def write_results(results_path, results):
+    """Write benchmark results to a JSON file, with details of the run."""
+    report = {
+        "commit": get_commit(),
+        "timestamp": time.time(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(results_path, "w") as f:
+        json.dump(report, f, indent=4)
+
+
+def compare_results(results, baseline_path):
+    """Print the change in median time since a previous run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]["median"]
+        new = result["median"]
+        print(
+            f"{name:<24} {format_time(old)} -> {format_time(new)}"
+            f" ({old / new:.2f}x)"
+        )
+
+
+def format_time(seconds):
+    """Returns a time formatted in a suitable unit."""
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
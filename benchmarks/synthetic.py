@@ -0,0 +1,48 @@
+"""Module to generate synthetic configurations and playgrounds."""
+import json
+
+TYPES = 50
+FILES = 2000
+FOLDERS = 50
+
+
+def make_type(files=FILES, folders=FOLDERS):
+    """Returns a playground type with many formatted files and folders."""
+    return {
+        "format": {"author": "Benchmark", "version": "1.0"},
+        "folders": ["pkg", *(f"pkg/sub{i}" for i in range(folders))],
+        "files": {
+            f"pkg/sub{i % folders}/module{i}.py": [
+                '"""Module ${name} by ${author}."""',
+                f"VALUE = {i}",
+                "VERSION = '${version}'",
+                "",
+                "def main():",
+                "    print('${name}', VALUE, VERSION)",
+            ]
+            for i in range(files)
+        },
+        "lib": ["${name}-dependency==${version}"],
+        "module": "pkg.sub0.module0",
+        "args": ["--name", "${name}"],
+    }
+
+
+def make_config(types=TYPES, files=FILES):
+    """Returns a configuration with many playground types."""
+    return {f"type{i}": make_type(files) for i in range(types)}
+
+
+def write_config(config_path, types=TYPES, files=FILES):
+    """Write a synthetic configuration to 'config_path'."""
+    with open(config_path, "w") as f:
+        json.dump(make_config(types, files), f, indent=4)
+
+
+def make_tree(root_dir, folders=20, files=500):
+    """Create a folder containing many small files."""
+    for i in range(folders):
+        folder = root_dir / f"folder{i}"
+        folder.mkdir(parents=True)
+        for j in range(files):
+            (folder / f"file{j}.txt").write_text("content\n")
@@ -1,17 +1,18 @@
-from .metadata import get_metadata
-
-_metadata = get_metadata()
-
-
-APP_NAME = _metadata["Name"]
+APP_NAME = __name__
 APP_TITLE = APP_NAME.title()
-DESCRIPTION = _metadata["Summary"]
-VERSION = _metadata["Version"]
-AUTHOR = _metadata["Author"]
-LICENSE = _metadata["License"]
-HOMEPAGE = _metadata["Home-page"]
 
-ABOUT_TEXT = f"""
+# Constants derived from the package metadata, which are only looked up on
+# first access since finding the metadata requires scanning the installed
+# distributions
+_METADATA_KEYS = {
+    "DESCRIPTION": "Summary",
+    "VERSION": "Version",
+    "AUTHOR": "Author",
+    "LICENSE": "License",
+    "HOMEPAGE": "Home-page",
+}
+
+_ABOUT_TEXT = """
 {APP_NAME} v {VERSION}
 {HOMEPAGE}
 
@@ -21,3 +22,18 @@ Version: {VERSION}
 Author: {AUTHOR}
 Licensed under: {LICENSE}
 Copyright: © 2022 {AUTHOR}"""
+
+
+def __getattr__(name):
+    """Retrieve the constants derived from the package metadata."""
+    if name not in _METADATA_KEYS and name != "ABOUT_TEXT":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .metadata import get_metadata
+
+    metadata = get_metadata()
+    constants = {key: metadata[field] for key, field in _METADATA_KEYS.items()}
+    constants["ABOUT_TEXT"] = _ABOUT_TEXT.format(
+        APP_NAME=APP_NAME, APP_TITLE=APP_TITLE, **constants
+    )
+    globals().update(constants)
+    return constants[name]
@@ -0,0 +1,71 @@
+"""Module to measure the resources used by repeated runs of a playground.
+
+Each run's wall time is measured around the child process, and its CPU time
+and peak memory usage are taken from the resource usage reported when it is
+reaped. Only wall time is available where this isn't supported (Windows)."""
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+
+from .exceptions import PGRunFailedError
+
+METRICS = ["wall", "cpu", "rss"]
+STATISTICS = ["min", "median", "p95", "max"]
+
+
+def run_once(argv, cwd, stdout=None):
+    """Run 'argv' in 'cwd', returning the resources used by the process.
+
+    Peak memory usage (rss) is in bytes; times are in seconds."""
+    start = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=cwd, stdout=stdout)
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        cpu = usage.ru_utime + usage.ru_stime
+        # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+        rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    else:
+        process.wait()
+        wall = time.perf_counter() - start
+        cpu = rss = None
+
+    if process.returncode:
+        raise PGRunFailedError(process.returncode)
+    return {"wall": wall, "cpu": cpu, "rss": rss}
+
+
+def run_repeated(argv, cwd, repeat, warmup=0, stdout=None):
+    """Run 'argv' 'warmup' times, then measure 'repeat' runs of it."""
+    for _ in range(warmup):
+        run_once(argv, cwd, stdout)
+    return [run_once(argv, cwd, stdout) for _ in range(repeat)]
+
+
+def summarize(runs):
+    """Returns the statistics of each metric across several runs."""
+    summary = {}
+    for metric in METRICS:
+        values = [run[metric] for run in runs if run[metric] is not None]
+        if not values:
+            summary[metric] = None
+            continue
+        values.sort()
+        summary[metric] = {
+            "min": values[0],
+            "median": median(values),
+            "p95": percentile(values, 95),
+            "max": values[-1],
+        }
+    return summary
+
+
+def percentile(values, percent):
+    """Returns a percentile of sorted 'values', interpolating between them."""
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
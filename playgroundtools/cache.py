@@ -0,0 +1,102 @@
+"""Module to manage the package cache shared by all playgrounds.
+
+Packages downloaded and built by pip are kept in a single cache so that
+playgrounds do not have to fetch the same packages repeatedly. The cache is
+bounded in size, evicting the least recently used files first."""
+import os
+
+from .exceptions import PGInvalidEnvError
+from .util import get_data_dir
+
+CACHE_SIZE_ENV = "PLAYGROUNDTOOLS_CACHE_SIZE"
+DEFAULT_CACHE_SIZE = 2048  # in megabytes
+MEGABYTE = 1024 * 1024
+
+
+def get_cache_dir():
+    """Retrieve the directory of the package cache."""
+    return get_data_dir() / "cache"
+
+
+def get_cache_limit():
+    """Retrieve the maximum size of the cache (in megabytes).
+
+    The limit can be overridden with the PLAYGROUNDTOOLS_CACHE_SIZE
+    environment variable, which must be a whole number of megabytes."""
+    limit = os.environ.get(CACHE_SIZE_ENV)
+    if not limit:
+        return DEFAULT_CACHE_SIZE
+    try:
+        size = int(limit)
+    except ValueError:
+        size = -1
+    if size < 0:
+        raise PGInvalidEnvError(
+            CACHE_SIZE_ENV, limit, "expected a size in megabytes"
+        )
+    return size
+
+
+def get_cache_entries(cache_dir):
+    """Return (last used, size, path) for every file in the cache."""
+    entries = []
+    stack = [cache_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat(follow_symlinks=False)
+                    last_used = max(stat.st_atime, stat.st_mtime)
+                    entries.append((last_used, stat.st_size, entry.path))
+    return entries
+
+
+def get_cache_info(cache_dir=None):
+    """Return information about the size and location of the cache."""
+    cache_dir = cache_dir or get_cache_dir()
+    entries = get_cache_entries(cache_dir)
+    return {
+        "dir": str(cache_dir),
+        "files": len(entries),
+        "size": sum(size for _, size, _ in entries),
+        "limit": get_cache_limit() * MEGABYTE,
+    }
+
+
+def prune_cache(limit=None, cache_dir=None):
+    """Evict the least recently used files until the cache fits 'limit'.
+
+    The 'limit' argument is given in megabytes and defaults to the configured
+    cache size. The number of bytes freed is returned."""
+    cache_dir = cache_dir or get_cache_dir()
+    limit = get_cache_limit() if limit is None else limit
+    entries = get_cache_entries(cache_dir)
+    excess = sum(size for _, size, _ in entries) - limit * MEGABYTE
+    freed = 0
+    for _, size, path in sorted(entries):
+        if freed >= excess:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        freed += size
+    if freed:
+        remove_empty_dirs(cache_dir)
+    return freed
+
+
+def remove_empty_dirs(folder):
+    """Remove empty directories below 'folder'."""
+    for root, _, _ in os.walk(folder, topdown=False):
+        if root != str(folder):
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
@@ -1,7 +1,17 @@
 from argparse import ArgumentParser
 
-from . import APP_NAME, DESCRIPTION
-from .commands import config, delete, new, print_about, print_version, run
+from . import APP_NAME
+from .commands import (
+    cache,
+    config,
+    delete,
+    gc,
+    list_playgrounds,
+    new,
+    print_about,
+    print_version,
+    run,
+)
 from .exceptions import status_manager
 
 
@@ -21,9 +31,22 @@ def main():
         parser.print_usage()
 
 
+class Parser(ArgumentParser):
+    """An argument parser that retrieves its description when needed.
+
+    The description comes from the package metadata, which is only looked up
+    when help is shown."""
+
+    def format_help(self):
+        from . import DESCRIPTION
+
+        self.description = DESCRIPTION
+        return super().format_help()
+
+
 def get_parser():
     """Set up an argument parser with commands."""
-    parser = ArgumentParser(description=DESCRIPTION)
+    parser = Parser()
     parser.add_argument(
         "-a",
         "--about",
@@ -38,13 +61,16 @@ def get_parser():
     )
 
     subcommands = parser.add_subparsers(
+        parser_class=ArgumentParser,
         title="Commands",
         dest="command",
         description="Commands for managing playgrounds.",
     )
 
     new_cmd = subcommands.add_parser("new", help="Create a new playground.")
-    new_cmd.add_argument("type", help="The type of playground to create.")
+    new_cmd.add_argument(
+        "type", nargs="?", help="The type of playground to create."
+    )
     new_cmd.add_argument(
         "-i",
         "--include",
@@ -63,7 +89,6 @@ def get_parser():
     new_cmd.add_argument(
         "-n",
         "--name",
-        required=True,
         help="The name of the playground to create.",
     )
     new_cmd.add_argument(
@@ -71,14 +96,55 @@ def get_parser():
         "--options",
         help="Optional arguments that override default interpolation (in JSON)",
     )
+    new_cmd.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        help="Only update the files of an existing playground that changed.",
+    )
+    new_cmd.add_argument(
+        "-l",
+        "--link",
+        action="store_true",
+        help="Clone files from a shared store instead of writing them.",
+    )
+    new_cmd.add_argument(
+        "-m",
+        "--manifest",
+        help="Create the playgrounds listed in a manifest file (in JSON).",
+    )
+    new_cmd.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="The number of playgrounds to create at once from a manifest.",
+    )
+    new_cmd.add_argument(
+        "-t",
+        "--trace",
+        help="Write a trace of the time taken by each stage to a file.",
+    )
     new_cmd.set_defaults(func=new)
 
     delete_cmd = subcommands.add_parser("delete", help="Delete a playground.")
     delete_cmd.add_argument(
-        "name", help="The name of the playground to delete."
+        "name",
+        nargs="+",
+        help="The names (or glob patterns) of the playgrounds to delete.",
+    )
+    delete_cmd.add_argument(
+        "-w",
+        "--wait",
+        action="store_true",
+        help="Wait for the playgrounds to be removed.",
     )
     delete_cmd.set_defaults(func=delete)
 
+    gc_cmd = subcommands.add_parser(
+        "gc", help="Remove deleted playgrounds left in the trash."
+    )
+    gc_cmd.set_defaults(func=gc)
+
     run_cmd = subcommands.add_parser(
         "run",
         help="Run a playground by running the commands in its settings file.",
@@ -94,7 +160,93 @@ def get_parser():
         default=[],
         help="Override the arguments to run the module with.",
     )
-    run_cmd.set_defaults(func=run)
+    run_mode = run_cmd.add_mutually_exclusive_group()
+    run_mode.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        help="Run the playground several times and report its resource usage.",
+    )
+    run_mode.add_argument(
+        "-p",
+        "--profile",
+        choices=["cpu", "memory"],
+        help="Profile the playground, saving the results in its folder.",
+    )
+    run_cmd.add_argument(
+        "-w",
+        "--warmup",
+        type=int,
+        default=0,
+        help="The number of runs to discard before measuring (with --repeat).",
+    )
+    run_cmd.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the measurements as JSON (with --repeat).",
+    )
+    run_cmd.add_argument(
+        "-x",
+        "--exclusive",
+        action="store_true",
+        help="Lock the playground while it runs, waiting for other users.",
+    )
+    run_cmd.add_argument(
+        "-t",
+        "--top",
+        type=int,
+        help="The number of entries to show in a profile (with --profile).",
+    )
+    run_cmd.set_defaults(func=run, exec=True)
+
+    list_cmd = subcommands.add_parser(
+        "list", help="List the playgrounds that have been created."
+    )
+    list_cmd.add_argument(
+        "-t", "--type", help="Only list playgrounds of the given type."
+    )
+    list_cmd.add_argument(
+        "-n",
+        "--name",
+        help="Only list playgrounds with names matching a glob pattern.",
+    )
+    list_cmd.add_argument(
+        "-s",
+        "--sort",
+        default="name",
+        choices=["name", "type", "created", "last_run", "size", "path"],
+        help="The field to sort playgrounds by.",
+    )
+    list_cmd.add_argument(
+        "-r",
+        "--reverse",
+        action="store_true",
+        help="Sort playgrounds in descending order.",
+    )
+    list_cmd.add_argument(
+        "--json", action="store_true", help="Output the playgrounds as JSON."
+    )
+    list_cmd.set_defaults(func=list_playgrounds)
+
+    cache_cmd = subcommands.add_parser(
+        "cache", help="Inspect or prune the shared package cache."
+    )
+    cache_subcommands = cache_cmd.add_subparsers(
+        title="Commands",
+        dest="subcommand",
+        help="Commands for managing the package cache.",
+    )
+    cache_prune_cmd = cache_subcommands.add_parser(
+        "prune", help="Evict the least recently used files from the cache."
+    )
+    cache_prune_cmd.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        help="The size (in MB) to shrink the cache to "
+        "(defaults to the limit).",
+    )
+    cache_cmd.set_defaults(func=cache)
 
     config_cmd = subcommands.add_parser(
         "config", help="Read or modify the configuration."
@@ -134,6 +286,26 @@ def get_parser():
         "-f", "--file", help="Add options from a custom configuration file."
     )
 
+    config_apply_cmd = config_subcommands.add_parser(
+        "apply",
+        help="Apply a list of edits to the configuration at once.",
+    )
+    config_apply_cmd.add_argument(
+        "-f",
+        "--file",
+        help="The file containing the edits (in JSON), or - for stdin.",
+    )
+
+    config_migrate_cmd = config_subcommands.add_parser(
+        "migrate",
+        help="Split the configuration into a directory of per-type files.",
+    )
+    config_migrate_cmd.add_argument(
+        "-d",
+        "--dir",
+        help="The directory to write to (defaults to the data directory).",
+    )
+
     config_cmd.add_argument(
         "-k",
         "--key",
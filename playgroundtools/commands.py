@@ -1,23 +1,75 @@
 import json
 import os
-import venv
-from shutil import rmtree
-
-from . import ABOUT_TEXT, APP_NAME, VERSION
-from .exceptions import set_status
-from .playground import clean_config, get_config, set_config
-from .util import get_command, get_python_path, get_venv_dir, remove_if_exists
+import subprocess
+import time
+from contextlib import nullcontext
+from functools import partial
+
+from . import APP_NAME
+from .cache import (
+    MEGABYTE,
+    get_cache_dir,
+    get_cache_info,
+    get_cache_limit,
+    prune_cache,
+)
+from .configdir import write_config_dir
+from .exceptions import (
+    PGInvalidOptionError,
+    PGLockTimeoutError,
+    cleanup,
+    get_result,
+    set_status,
+)
+from .locks import lock_collector, lock_config, lock_playground, lock_trash
+from .pipeline import Stage, run_stages
+from .playground import (
+    STATE_FILE,
+    clean_config,
+    get_config,
+    get_entry_args,
+    get_manifest,
+    get_state,
+    set_config,
+)
+from .profiler import get_profile_argv
+from .registry import get_playgrounds, register, touch, unregister
+from .store import link_text, prune_store
+from .tracing import (
+    annotate,
+    is_tracing,
+    span,
+    start_tracing,
+    stop_tracing,
+    write_trace,
+)
+from .util import (
+    get_argv,
+    get_dir_size,
+    get_file_text,
+    get_python_path,
+    get_staging_dir,
+    get_venv_dir,
+    hash_file,
+    hash_text,
+    remove_if_exists,
+)
+from .venvs import create_venv, relocate_venv
 
 # Functions for the parser
 
 
 def print_about():
     """Print text about the package."""
+    from . import ABOUT_TEXT
+
     print(ABOUT_TEXT)
 
 
 def print_version():
     """Print the package version."""
+    from . import VERSION
+
     print(f"{APP_NAME} version {VERSION}")
 
 
@@ -26,20 +78,225 @@ def print_version():
 
 def new(args, output=None):
     """Create a new playground."""
-    raw_config = get_config()
-    config = clean_config(args, raw_config)
+    link = getattr(args, "link", False)
+    manifest = getattr(args, "manifest", None)
+    if manifest:
+        for option in ["update", "trace"]:
+            if getattr(args, option, None):
+                raise PGInvalidOptionError(
+                    f"--{option} can't be used with --manifest"
+                )
+        jobs = getattr(args, "jobs", None)
+        if jobs is not None and jobs < 1:
+            raise PGInvalidOptionError("--jobs must be at least 1")
+        entries = get_manifest(manifest)
+        return new_batch(entries, args.verbose, jobs, output, link)
+
+    trace_path = getattr(args, "trace", None)
+    if trace_path:
+        start_tracing(args.verbose)
+    try:
+        with span("new", "command"):
+            raw_config = get_config()
+            config = clean_config(args, raw_config)
+            with lock_playground(config["dir"]):
+                if getattr(args, "update", False):
+                    update_playground(config, output, link)
+                else:
+                    create_playground(config, output, link)
+                with span("register"):
+                    register_playground(config, args.type)
+    finally:
+        if trace_path:
+            write_trace(trace_path, stop_tracing())
+
+    set_status("Playground creation successful.", output)
+
+
+def new_batch(entries, verbose=0, max_workers=None, output=None, link=False):
+    """Create many playgrounds concurrently from a list of entries.
+
+    Each entry is a dictionary with the 'name', 'type', 'lib' and 'options'
+    of a playground. The configuration is read once and playgrounds are
+    created on a pool of 'max_workers' processes. A failed playground is
+    cleaned up without affecting the others. A list with the result of each
+    entry is returned. See create_playground for 'link'."""
+    from concurrent.futures import ProcessPoolExecutor
 
+    raw_config = get_config()
+    batch = [get_entry_args(entry, verbose) for entry in entries]
+    errors = [None] * len(batch)
+    futures = {}
+    with ProcessPoolExecutor(max_workers) as executor:
+        for index, args in enumerate(batch):
+            try:
+                config = clean_config(args, raw_config)
+            except Exception as err:
+                errors[index] = err
+            else:
+                future = executor.submit(create_locked, config, None, link)
+                futures[index] = (future, config)
+
+        for index, (future, config) in futures.items():
+            try:
+                future.result()
+            except Exception as err:
+                cleanup(batch[index])
+                errors[index] = err
+            else:
+                register_playground(config, batch[index].type)
+
+    summary = []
+    for args, err in zip(batch, errors):
+        result = get_result(err) if err else "Playground creation successful."
+        set_status(f"{args.name}: {result}", output)
+        summary.append(
+            {"name": args.name, "success": not err, "result": result}
+        )
+    return summary
+
+
+def create_locked(config, output=None, link=False):
+    """Create a playground while holding its lock."""
+    with lock_playground(config["dir"]):
+        create_playground(config, output, link)
+
+
+def create_playground(config, output=None, link=False):
+    """Create a playground from its cleaned configuration.
+
+    The playground is built in a staging directory and moved into place once
+    complete, or discarded if creation fails. The caller must hold the
+    playground's lock. Creating the files of the playground is independent of
+    creating its virtual environment, so these stages are run concurrently.
+    If 'link' is set, files are linked from the file store rather than
+    written."""
     playground_dir = config["dir"]
+    staging_dir = get_staging_dir(playground_dir)
     verbose = config["verbosity"]
 
-    new_playground(playground_dir, verbose, output)
-    new_folders(playground_dir, config["folders"], verbose, output)
-    new_files(playground_dir, config["files"], verbose, output)
-    new_settings(playground_dir, config["settings"], verbose, output)
-    new_venv(playground_dir, verbose, output)
-    install_reqs(playground_dir, verbose, output)
+    stages = [
+        Stage(
+            "playground",
+            partial(new_playground, staging_dir, verbose, output),
+        ),
+        Stage(
+            "folders",
+            partial(
+                new_folders, staging_dir, config["folders"], verbose, output
+            ),
+            requires=["playground"],
+        ),
+        Stage(
+            "files",
+            partial(
+                new_files,
+                staging_dir,
+                config["files"],
+                verbose,
+                output,
+                link,
+            ),
+            requires=["folders"],
+        ),
+        Stage(
+            "venv",
+            partial(new_venv, staging_dir, verbose, output),
+            requires=["playground"],
+        ),
+        Stage(
+            "settings",
+            partial(
+                new_settings,
+                staging_dir,
+                config["settings"],
+                verbose,
+                output,
+                playground_dir,
+            ),
+            requires=["venv"],
+        ),
+        Stage(
+            "reqs",
+            partial(install_reqs, staging_dir, verbose, output),
+            requires=["venv", "files"],
+        ),
+        Stage(
+            "state",
+            partial(
+                new_state, staging_dir, config["files"], config["folders"]
+            ),
+            requires=["files"],
+        ),
+    ]
+    try:
+        run_stages(stages)
+        with span("commit"):
+            commit_playground(staging_dir, playground_dir, verbose, output)
+    except BaseException:
+        # Roll back while the playground is locked, so that the staging
+        # directory is known to belong to this build
+        discard_staging(staging_dir)
+        raise
+
+
+def discard_staging(staging_dir):
+    """Move a playground's staging directory to the trash, if it exists."""
+    if staging_dir.exists():
+        from .trash import move_to_trash, spawn_collector
+
+        move_to_trash(staging_dir)
+        spawn_collector()
+
+
+def update_playground(config, output=None, link=False):
+    """Update an existing playground to match its cleaned configuration.
+
+    Only the files whose content differs from the configuration are written,
+    and files and folders which are no longer configured are removed unless
+    they were modified. Requirements are only reinstalled if they changed."""
+    playground_dir = config["dir"]
+    verbose = config["verbosity"]
+    if not playground_dir.exists():
+        return create_playground(config, output, link)
+
+    state = get_state(playground_dir)
+    hashes = {
+        name: hash_text(get_file_text(content))
+        for name, content in config["files"].items()
+    }
+    changed = {
+        name: config["files"][name]
+        for name, file_hash in hashes.items()
+        if hash_file(playground_dir / name) != file_hash
+    }
+    removed_files = {
+        name: file_hash
+        for name, file_hash in state["files"].items()
+        if name not in hashes
+    }
+    removed_folders = set(state["folders"]) - set(config["folders"])
+
+    with span("remove"):
+        remove_files(playground_dir, removed_files, verbose, output)
+        remove_folders(playground_dir, removed_folders, verbose, output)
+    with span("folders"):
+        new_folders(playground_dir, config["folders"], verbose, output)
+    with span("files"):
+        new_files(playground_dir, changed, verbose, output, link)
 
-    set_status("Playground creation successful.", output)
+    venv_path = get_venv_dir(playground_dir)
+    venv_created = not get_python_path(venv_path).exists()
+    if venv_created:
+        with span("venv"):
+            new_venv(playground_dir, verbose, output)
+    with span("settings"):
+        new_settings(playground_dir, config["settings"], verbose, output)
+    if venv_created or "requirements/requirements.in" in changed:
+        with span("reqs"):
+            install_reqs(playground_dir, verbose, output)
+    with span("state"):
+        new_state(playground_dir, config["files"], config["folders"])
 
 
 def new_playground(playground_dir, verbose=0, output=None):
@@ -50,6 +307,34 @@ def new_playground(playground_dir, verbose=0, output=None):
     playground_dir.mkdir()
 
 
+def register_playground(config, type):
+    """Add a newly created playground to the registry."""
+    playground_dir = config["dir"]
+    python_path = get_python_path(get_venv_dir(playground_dir))
+    size = get_dir_size(playground_dir)
+    register(playground_dir, type, python_path, size)
+
+
+def commit_playground(staging_dir, playground_dir, verbose=0, output=None):
+    """Move a playground from its staging directory into place.
+
+    The move is done by renaming, so a partially created playground is never
+    visible at the playground directory."""
+    if verbose:
+        set_status("Moving the playground into place...", output)
+    venv_path = get_venv_dir(staging_dir)
+    relocate_venv(venv_path, venv_path, get_venv_dir(playground_dir))
+
+    if playground_dir.exists():
+        from .trash import move_to_trash, spawn_collector
+
+        move_to_trash(playground_dir)
+        staging_dir.rename(playground_dir)
+        spawn_collector()
+    else:
+        staging_dir.rename(playground_dir)
+
+
 def new_folders(playground_dir, folders, verbose=0, output=None):
     """Create all folders for a playground."""
     if verbose:
@@ -62,26 +347,86 @@ def new_folders(playground_dir, folders, verbose=0, output=None):
         folder_path.mkdir(exist_ok=True)
 
 
-def new_files(playground_dir, files, verbose=0, output=None):
-    """Create all files for a playground."""
+def new_files(playground_dir, files, verbose=0, output=None, link=False):
+    """Create all files for a playground.
+
+    Existing files are replaced rather than overwritten. If 'link' is set,
+    files are cloned from the file store."""
     if verbose:
         set_status("Creating necessary files...", output)
+    written = 0
     for name, content in files.items():
         file_path = playground_dir / name
         if verbose > 1:
             print("\t", end="")
             set_status(f"Creating {file_path}", output)
-        with open(file_path, "w") as f:
-            for line in content:
-                print(line, file=f)
+        with span(name, "file", level=2) as trace_args:
+            text = get_file_text(content)
+            file_path.unlink(missing_ok=True)
+            if link:
+                link_text(text, file_path)
+            else:
+                with open(file_path, "w") as f:
+                    trace_args["bytes"] = f.write(text)
+                    written += trace_args["bytes"]
+    annotate(bytes=written)
+
+
+def remove_files(playground_dir, files, verbose=0, output=None):
+    """Remove files from a playground unless they were modified.
+
+    The 'files' argument maps file names to the hash of their content when
+    they were created."""
+    for name, file_hash in files.items():
+        file_path = playground_dir / name
+        if hash_file(file_path) != file_hash:
+            continue
+        if verbose > 1:
+            print("\t", end="")
+            set_status(f"Removing {file_path}", output)
+        file_path.unlink()
 
 
-def new_settings(playground_dir, settings, verbose=0, output=None):
-    """Create the settings file for a playground."""
+def remove_folders(playground_dir, folders, verbose=0, output=None):
+    """Remove folders from a playground if they are empty."""
+    for folder in sorted(folders, reverse=True):
+        folder_path = playground_dir / folder
+        try:
+            folder_path.rmdir()
+        except OSError:
+            continue
+        if verbose > 1:
+            print("\t", end="")
+            set_status(f"Removing {folder_path}", output)
+
+
+def new_state(playground_dir, files, folders):
+    """Record the files and folders created in a playground."""
+    state = {
+        "files": {
+            name: hash_text(get_file_text(content))
+            for name, content in files.items()
+        },
+        "folders": folders,
+    }
+    state_path = playground_dir / STATE_FILE
+    with open(state_path, "w") as f:
+        json.dump(state, f, indent=4)
+
+
+def new_settings(
+    playground_dir, settings, verbose=0, output=None, target_dir=None
+):
+    """Create the settings file for a playground.
+
+    The 'target_dir' argument is the directory the playground will be moved
+    to, if it is not created in place."""
     if verbose:
         set_status("Creating the settings file...", output)
     venv_path = get_venv_dir(playground_dir)
     python_path = get_python_path(venv_path)
+    if target_dir:
+        python_path = target_dir / python_path.relative_to(playground_dir)
     settings = {"python": str(python_path), **settings}
 
     settings_path = playground_dir / "settings.json"
@@ -94,7 +439,9 @@ def new_venv(playground_dir, verbose=0, output=None):
     if verbose:
         set_status("Creating the virtual environment...", output)
     venv_path = get_venv_dir(playground_dir)
-    venv.create(venv_path, with_pip=True)
+    create_venv(venv_path)
+    if is_tracing():
+        annotate(bytes=get_dir_size(venv_path))
 
 
 def install_reqs(playground_dir, verbose=0, output=None):
@@ -105,21 +452,48 @@ def install_reqs(playground_dir, verbose=0, output=None):
     python_path = get_python_path(venv_path)
 
     reqs_path = playground_dir / "requirements" / "requirements.in"
-    args = ["install", "--no-cache-dir", "-r", str(reqs_path)]
+    cache_dir = get_cache_dir()
+    # Check the cache's limit before installing anything
+    cache_limit = get_cache_limit()
+    args = ["install", "--cache-dir", str(cache_dir), "-r", str(reqs_path)]
     if verbose:
         args.append("-v")
 
-    cmd = get_command(python_path, "pip", args)
-    os.system(cmd)
+    if is_tracing():
+        size = get_dir_size(venv_path)
+    subprocess.run(get_argv(python_path, "pip", args))
+    if is_tracing():
+        annotate(bytes=get_dir_size(venv_path) - size)
+    prune_cache(cache_limit, cache_dir)
 
 
 # Functions for the 'delete' command
 
 
 def delete(args, output=None):
-    """Delete a playground."""
+    """Delete playgrounds.
+
+    Playgrounds are moved to the trash and removed in the background, unless
+    the 'wait' option is set."""
+    from .trash import (
+        move_to_trash,
+        reap,
+        remove_trash_dir,
+        spawn_collector,
+    )
+
     config = clean_config(args)
-    rmtree(config["dir"])
+    for playground_dir in config["dirs"]:
+        # The trash lock keeps a collector from removing the trash
+        # directory before the playground is moved and unregistered
+        with lock_playground(playground_dir), lock_trash():
+            trash_path = move_to_trash(playground_dir, locked=True)
+            unregister(playground_dir)
+        if config["wait"]:
+            reap(trash_path)
+            remove_trash_dir(trash_path.parent)
+    if not config["wait"]:
+        spawn_collector()
 
     set_status("Playground deletion successful.", output)
 
@@ -127,32 +501,207 @@ def delete(args, output=None):
 # Functions for the 'run' command
 
 
-def run(args):
-    """Run a playground."""
+def run(args, output=None):
+    """Run a playground, returning its exit code.
+
+    If the 'exec' option is set, the process is replaced by the playground's
+    interpreter (or exits with its exit code where that isn't possible). If
+    the 'exclusive' option is set, the playground is locked while it runs."""
+    config = clean_config(args)
+    argv = get_argv(**config["settings"])
+    touch(config["dir"])
+    if getattr(args, "profile", None):
+        argv = get_profile_argv(
+            **config["settings"],
+            mode=args.profile,
+            playground_dir=config["dir"],
+            top=getattr(args, "top", None),
+        )
+
+    execute = getattr(args, "exec", False)
+    exclusive = getattr(args, "exclusive", False)
+    with lock_playground(config["dir"]) if exclusive else nullcontext():
+        if getattr(args, "repeat", None):
+            return benchmark(args, config["dir"], argv)
+        # The lock isn't kept across exec, so the playground is run as a
+        # child process while it is locked
+        if execute and not exclusive and os.name != "nt":
+            os.chdir(config["dir"])
+            os.execv(argv[0], argv)
+        returncode = subprocess.call(argv, cwd=config["dir"])
+    if returncode < 0:
+        # The playground was terminated by a signal
+        returncode = 128 - returncode
+    if execute:
+        raise SystemExit(returncode)
+    return returncode
+
+
+def benchmark(args, playground_dir, argv):
+    """Run a playground repeatedly, reporting the resources it used."""
+    from .bench import run_repeated, summarize
+
+    warmup = getattr(args, "warmup", 0) or 0
+    as_json = getattr(args, "json", False)
+    # Send the playground's output to stderr, keeping the JSON results apart
+    stdout = 2 if as_json else None
+    runs = run_repeated(argv, playground_dir, args.repeat, warmup, stdout)
+    results = {
+        "path": str(playground_dir),
+        "argv": argv,
+        "timestamp": time.time(),
+        "repeat": args.repeat,
+        "warmup": warmup,
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+    if as_json:
+        print_json(results)
+    else:
+        print_summary(results["summary"])
+    return results
+
+
+def print_summary(summary):
+    """Print a table of the statistics of each metric."""
+    from .bench import STATISTICS
+
+    metrics = [
+        ("WALL (s)", "wall", 1),
+        ("CPU (s)", "cpu", 1),
+        ("PEAK RSS (MB)", "rss", MEGABYTE),
+    ]
+    headings = ["", *(name.upper() for name in STATISTICS)]
+    rows = []
+    for heading, metric, unit in metrics:
+        stats = summary[metric]
+        cells = [
+            f"{stats[name] / unit:.3f}" if stats else "-"
+            for name in STATISTICS
+        ]
+        rows.append([heading, *cells])
+    widths = [max(map(len, column)) for column in zip(headings, *rows)]
+    for label, *cells in [headings, *rows]:
+        cells = [cell.rjust(width) for cell, width in zip(cells, widths[1:])]
+        print("  ".join([label.ljust(widths[0]), *cells]))
+
+
+# Functions for the 'gc' command
+
+
+def gc(args, output=None):
+    """Remove playgrounds which have been moved to the trash."""
+    from .trash import collect_garbage
+
+    try:
+        with lock_collector():
+            removed = collect_garbage()
+    except PGLockTimeoutError:
+        # Another collector will remove everything in the trash
+        set_status("The trash is already being emptied.", output)
+        return 0
+    set_status(f"Removed {removed} folders from the trash.", output)
+    return removed
+
+
+# Functions for the 'list' command
+
+
+def list_playgrounds(args, output=None):
+    """List the registered playgrounds."""
     config = clean_config(args)
-    cmd = get_command(**config["settings"])
+    playgrounds = get_playgrounds(
+        config["type"], config["name"], config["sort"], config["reverse"]
+    )
+    if config["json"]:
+        print_json(playgrounds)
+    else:
+        print_table(playgrounds)
+    return playgrounds
+
+
+def print_table(playgrounds):
+    """Print a table describing each playground."""
+    headings = ["NAME", "TYPE", "CREATED", "LAST RUN", "SIZE", "PATH"]
+    rows = [
+        [
+            playground["name"],
+            playground["type"] or "",
+            format_time(playground["created"]),
+            format_time(playground["last_run"]),
+            format_size(playground["size"]),
+            playground["path"],
+        ]
+        for playground in playgrounds
+    ]
+    widths = [max(map(len, column)) for column in zip(headings, *rows)]
+    for row in [headings, *rows]:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        print("  ".join(cells).rstrip())
+
+
+def format_time(timestamp):
+    """Returns a timestamp formatted in local time."""
+    if timestamp is None:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def format_size(size):
+    """Returns a size in bytes formatted in megabytes."""
+    if size is None:
+        return "-"
+    return f"{size / MEGABYTE:.1f} MB"
 
-    os.chdir(config["dir"])
-    os.system(cmd)
+
+# Functions for the 'cache' command
+
+
+def cache(args, output=None):
+    """Inspect or prune the package cache."""
+    config = clean_config(args)
+    if config["prune"]:
+        freed = prune_cache(config["size"], config["dir"])
+        set_status(f"Freed {freed} bytes from the cache.", output)
+        removed = prune_store()
+        set_status(f"Removed {removed} unused files from the store.", output)
+    info = get_cache_info(config["dir"])
+    print_json(info)
+    return info
 
 
 # Functions for the 'config' command
 
 
 def config(args, output=None):
-    """Read or modify the configuration."""
-    raw_config = get_config()
+    """Read or modify the configuration.
 
-    config = clean_config(args, raw_config)
+    The configuration is locked while it is modified, so concurrent changes
+    are not lost."""
     if args.subcommand:
-        set_config(config)
-        set_status("Configuration modified successfully.", output)
-    elif args.read:
+        with lock_config():
+            return modify_config(args, output)
+
+    raw_config = get_config()
+    config = clean_config(args, raw_config)
+    if args.read:
         value = config["value"]
         print_json(value)
         return value
+    print_json(config)
+    return config
+
+
+def modify_config(args, output=None):
+    """Modify the configuration with one of the config subcommands."""
+    raw_config = get_config()
+    config = clean_config(args, raw_config)
+    if args.subcommand == "migrate":
+        write_config_dir(config["config"], config["dir"])
+        set_status(f"Configuration migrated to {config['dir']}.", output)
     else:
-        print_json(config)
+        set_config(config)
+        set_status("Configuration modified successfully.", output)
     return config
 
 
@@ -0,0 +1,112 @@
+"""Module to store the configuration as a directory of per-type files.
+
+A configuration directory contains an index, which maps the name of each
+playground type to its file, and a file for each type. Types are only read
+when they are used, so a command which needs one type does not decode all of
+them."""
+import json
+from collections.abc import MutableMapping
+from pathlib import Path
+from urllib.parse import quote
+
+from .exceptions import PGJSONFormatError
+from .util import write_atomic
+
+INDEX_NAME = "index.json"
+TYPES_DIR = "types"
+INDEX_VERSION = 1
+
+
+def get_type_file(type):
+    """Returns the name of the file (relative to the directory) of a type."""
+    return f"{TYPES_DIR}/{quote(type, safe='')}.json"
+
+
+def is_config_dir(path):
+    """Check whether 'path' is a configuration directory."""
+    return (Path(path) / INDEX_NAME).is_file()
+
+
+def read_json(file_path):
+    """Returns the JSON-decoded contents of a file."""
+    with open(file_path) as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as err:
+            raise PGJSONFormatError(file_path, str(err))
+
+
+def write_json(file_path, value):
+    """Write the JSON-encoded version of 'value' to a file."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(file_path, json.dumps(value, indent=4))
+
+
+class LazyConfig(MutableMapping):
+    """Represents a configuration stored in a directory.
+
+    Types are read when first accessed and cached. Modifications are kept in
+    memory until the configuration is saved, which only writes the types
+    that were read (or set) and the index."""
+
+    def __init__(self, config_dir):
+        self.config_dir = Path(config_dir)
+        index = read_json(self.config_dir / INDEX_NAME)
+        self._files = dict(index["types"])
+        self._loaded = {}
+
+    def __getitem__(self, type):
+        if type not in self._loaded:
+            file_path = self.config_dir / self._files[type]
+            self._loaded[type] = read_json(file_path)
+        return self._loaded[type]
+
+    def __setitem__(self, type, value):
+        self._files.setdefault(type, get_type_file(type))
+        self._loaded[type] = value
+
+    def __delitem__(self, type):
+        del self._files[type]
+        self._loaded.pop(type, None)
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def __repr__(self):
+        return f"LazyConfig({str(self.config_dir)!r})"
+
+    def save(self):
+        """Write the modified configuration to its directory.
+
+        Files of types which were deleted are removed."""
+        for type, value in self._loaded.items():
+            write_json(self.config_dir / self._files[type], value)
+        write_index(self.config_dir, self._files)
+        remove_unused(self.config_dir, self._files)
+
+
+def write_index(config_dir, files):
+    """Write the index of a configuration directory."""
+    index = {"version": INDEX_VERSION, "types": files}
+    write_json(config_dir / INDEX_NAME, index)
+
+
+def remove_unused(config_dir, files):
+    """Remove the type files which are not in the index."""
+    used = {config_dir / file_name for file_name in files.values()}
+    for file_path in (config_dir / TYPES_DIR).glob("*.json"):
+        if file_path not in used:
+            file_path.unlink()
+
+
+def write_config_dir(config, config_dir):
+    """Write a whole configuration to a directory of per-type files."""
+    config_dir = Path(config_dir)
+    files = {type: get_type_file(type) for type in config}
+    for type, file_name in files.items():
+        write_json(config_dir / file_name, config[type])
+    write_index(config_dir, files)
+    remove_unused(config_dir, files)
@@ -1,9 +1,8 @@
 import os
 from contextlib import contextmanager
 from pathlib import Path
-from tkinter import messagebox
 
-from .util import get_full_path, remove_if_exists
+from .util import get_full_path, get_staging_dir
 
 
 class PlaygroundException(Exception):
@@ -42,6 +41,34 @@ class PGTypeNotEnteredError(PlaygroundException):
     pass
 
 
+class PGRunFailedError(PlaygroundException):
+    pass
+
+
+class PGInvalidEditError(PlaygroundException):
+    pass
+
+
+class PGInvalidPathError(PlaygroundException):
+    pass
+
+
+class PGLockTimeoutError(PlaygroundException):
+    pass
+
+
+class PGInvalidEnvError(PlaygroundException):
+    pass
+
+
+class PGInvalidManifestError(PlaygroundException):
+    pass
+
+
+class PGInvalidOptionError(PlaygroundException):
+    pass
+
+
 @contextmanager
 def status_manager(args, status=None):
     """Shows errors and cleans up the environment in case of exceptions."""
@@ -60,6 +87,8 @@ def set_status(text, status=None, error=False):
     if status:
         status.set(text)
         if error:
+            from tkinter import messagebox
+
             messagebox.showerror("Error", text)
     else:
         print(text)
@@ -76,13 +105,34 @@ def get_result(err):
         PGJSONFormatError: "JSON format error in '{0}': {1}",
         PGNameNotEnteredError: "The playground name has not been entered.",
         PGTypeNotEnteredError: "The playground type has not been set.",
+        PGRunFailedError: "The playground exited with code {0}.",
+        PGInvalidEditError: "Invalid configuration edit: {0}",
+        PGInvalidPathError: "Invalid configuration path: '{0}'",
+        PGLockTimeoutError: "{0} is in use by another process.",
+        PGInvalidEnvError: "Invalid value for {0}: '{1}' ({2})",
+        PGInvalidManifestError: "Invalid manifest '{0}': {1}",
+        PGInvalidOptionError: "Invalid option: {0}",
     }
     result = results.get(type(err), str(err))
     return result.format(*err.args)
 
 
 def cleanup(args):
-    """Cleans up the environment in case of an error."""
-    if args.command == "new":
+    """Cleans up the environment in case of an error.
+
+    A staging directory left behind by the new command is only removed if no
+    other process is building the playground."""
+    if args.command == "new" and getattr(args, "name", None):
+        from .locks import lock_playground
+
         playground_dir = get_full_path(args.name)
-        remove_if_exists(playground_dir)
+        try:
+            with lock_playground(playground_dir, timeout=0):
+                staging_dir = get_staging_dir(playground_dir)
+                if staging_dir.exists():
+                    from .trash import move_to_trash, spawn_collector
+
+                    move_to_trash(staging_dir)
+                    spawn_collector()
+        except PGLockTimeoutError:
+            pass
@@ -1,3 +1,5 @@
+import queue
+import threading
 from argparse import Namespace
 from webbrowser import open as open_url
 
@@ -6,12 +8,17 @@ from .commands import delete, new
 from .exceptions import (
     PGNameNotEnteredError,
     PGTypeNotEnteredError,
-    status_manager,
+    cleanup,
+    get_result,
+    set_status,
 )
 from .playground import get_config
+from .registry import get_playgrounds
 from .views.about import AboutDialog
 from .views.main import MainWindow
 
+POLL_INTERVAL = 50  # in milliseconds
+
 
 def main():
     """The main entry point for the GUI app."""
@@ -19,6 +26,32 @@ def main():
     app.run()
 
 
+class QueueStatus:
+    """A status which reports its text through a queue.
+
+    Commands running on a worker thread set it in place of the status bar,
+    which may only be updated by the main thread."""
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+    def set(self, text):
+        self.jobs.put(("status", text))
+
+
+def run_job(args, jobs):
+    """Run a command, reporting its progress and outcome through 'jobs'."""
+    try:
+        args.func(args, QueueStatus(jobs))
+    except (Exception, KeyboardInterrupt) as err:
+        try:
+            cleanup(args)
+        finally:
+            jobs.put(("error", get_result(err)))
+    else:
+        jobs.put(("done", None))
+
+
 class App:
     """The main controller for the GUI."""
 
@@ -34,8 +67,10 @@ class App:
 
         self.delete_view = self.window.delete_view
         self.delete_btn = self.delete_view.delete_btn
+        self.delete_chooser = self.delete_view.name_field
 
         self.status = self.window.status
+        self.jobs = queue.Queue()
 
         self._set_bindings()
         self._set_configurations()
@@ -55,6 +90,13 @@ class App:
 
         self.new_btn.configure(command=self.new_cmd)
         self.delete_btn.configure(command=self.delete_cmd)
+        self.refresh_playgrounds()
+
+    def refresh_playgrounds(self):
+        """Refreshes the playgrounds that can be chosen for deletion."""
+        playgrounds = get_playgrounds()
+        paths = [playground["path"] for playground in playgrounds]
+        self.delete_chooser.configure(values=paths)
 
     def refresh_type(self, event=None):
         """Refreshes the directory preview upon a type change."""
@@ -72,6 +114,8 @@ class App:
 
     def refresh_file(self, event=None):
         """Refreshes the file preview when a file is selected."""
+        # Stop rendering the previous file before anything else
+        self.new_file_preview.cancel()
         selected_file = self.new_dir_preview.focus()
         item_values = self.new_dir_preview.item(selected_file, "values")
         filename = item_values[0]
@@ -108,10 +152,41 @@ class App:
         self.run_command(args)
 
     def run_command(self, args):
-        """Dispatches a command based on args."""
+        """Dispatches a command based on args.
+
+        The command runs on a worker thread, which reports its progress
+        through a queue polled by the main thread, so the window stays
+        responsive. Commands can't be started while one is running."""
         args.verbose = 1
-        with status_manager(args, self.status):
-            args.func(args, self.status)
+        self.set_busy(True)
+        worker = threading.Thread(
+            target=run_job, args=(args, self.jobs), daemon=True
+        )
+        worker.start()
+        self.root.after(POLL_INTERVAL, self.poll_jobs)
+
+    def poll_jobs(self):
+        """Shows the messages reported by the running command."""
+        while True:
+            try:
+                kind, text = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                self.status.set(text)
+                continue
+            if kind == "error":
+                set_status(text, self.status, error=True)
+            self.set_busy(False)
+            self.refresh_playgrounds()
+            return
+        self.root.after(POLL_INTERVAL, self.poll_jobs)
+
+    def set_busy(self, busy):
+        """Disables the command buttons while a command is running."""
+        state = ["disabled"] if busy else ["!disabled"]
+        self.new_btn.state(state)
+        self.delete_btn.state(state)
 
     def _check_requirements(self, args):
         if not args.name:
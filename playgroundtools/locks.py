@@ -0,0 +1,127 @@
+"""Module to keep processes from modifying the same things at once.
+
+Locks are advisory and held on files in the data directory, so they only
+exclude other processes of this package. They are taken with flock on POSIX
+and msvcrt on Windows, and are released by the operating system if the
+process holding them exits."""
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+
+from .exceptions import PGInvalidEnvError, PGLockTimeoutError
+from .util import get_data_dir
+
+LOCK_TIMEOUT_ENV = "PLAYGROUNDTOOLS_LOCK_TIMEOUT"
+DEFAULT_LOCK_TIMEOUT = 300  # in seconds
+POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 0.5
+
+
+def get_lock_dir():
+    """Retrieve the directory of the lock files."""
+    return get_data_dir() / "locks"
+
+
+def get_lock_timeout():
+    """Retrieve how long to wait for a lock (in seconds).
+
+    The timeout can be overridden with the PLAYGROUNDTOOLS_LOCK_TIMEOUT
+    environment variable, which must be a number of seconds."""
+    timeout = os.environ.get(LOCK_TIMEOUT_ENV)
+    if not timeout:
+        return DEFAULT_LOCK_TIMEOUT
+    try:
+        seconds = float(timeout)
+    except ValueError:
+        seconds = -1
+    if not seconds >= 0:
+        raise PGInvalidEnvError(
+            LOCK_TIMEOUT_ENV, timeout, "expected a number of seconds"
+        )
+    return seconds
+
+
+@contextmanager
+def lock(name, timeout=None, description=None):
+    """Hold the lock called 'name' for the body of the with statement.
+
+    If another process holds the lock for more than 'timeout' seconds, a
+    PGLockTimeoutError is raised naming the 'description' of what is locked.
+    A timeout of 0 fails immediately if the lock is held."""
+    timeout = get_lock_timeout() if timeout is None else timeout
+    lock_dir = get_lock_dir()
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / f"{name}.lock", "a+b") as f:
+        deadline = time.monotonic() + timeout
+        interval = POLL_INTERVAL
+        while not try_lock(f.fileno()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PGLockTimeoutError(description or name)
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            unlock(f.fileno())
+
+
+def try_lock(fd):
+    """Attempt to lock an open file, returning whether it was locked."""
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def unlock(fd):
+    """Unlock a file locked by try_lock."""
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def lock_playground(playground_dir, timeout=None):
+    """Returns the lock of a playground, used while it is modified or run."""
+    digest = hashlib.sha1(str(playground_dir).encode()).hexdigest()[:16]
+    description = f"The playground '{playground_dir}'"
+    return lock(f"playground-{digest}", timeout, description)
+
+
+def lock_config(timeout=None):
+    """Returns the lock of the configuration, used while it is modified."""
+    return lock("config", timeout, "The configuration")
+
+
+def lock_trash(timeout=None):
+    """Returns the lock of the trash directories.
+
+    It is held briefly while a trash directory is created or removed along
+    with its record in the registry, so the two always agree."""
+    return lock("trash", timeout, "The trash")
+
+
+def lock_collector():
+    """Returns the lock of the garbage collector.
+
+    Only one collector needs to run at a time, so this doesn't wait."""
+    return lock("gc", 0, "The garbage collector")
@@ -0,0 +1,57 @@
+"""Module to run stages of work that depend on one another.
+
+Stages are executed on a thread pool as soon as all of the stages they
+require have finished, so independent stages overlap."""
+from .tracing import traced
+
+MAX_WORKERS = 4
+
+
+class Stage:
+    """Represents a unit of work that depends on other stages."""
+
+    def __init__(self, name, func, requires=()):
+        self.name = name
+        self.func = func
+        self.requires = set(requires)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def run_stages(stages, max_workers=MAX_WORKERS):
+    """Run 'stages' concurrently, respecting their dependencies.
+
+    A dictionary mapping stage names to their results is returned. If a stage
+    fails, no further stages are started and its exception is raised once the
+    running stages have finished. Each stage is traced while tracing is
+    enabled."""
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pending = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = stage.requires - pending.keys()
+        if missing:
+            raise ValueError(f"Unknown stages required by {stage}: {missing}")
+
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers) as executor:
+        while pending or running:
+            ready = [
+                stage
+                for stage in pending.values()
+                if stage.requires <= results.keys()
+            ]
+            for stage in ready:
+                del pending[stage.name]
+                func = traced(stage.func, stage.name)
+                running[executor.submit(func)] = stage
+            if not running:
+                raise ValueError(f"Cyclic dependencies between {pending}")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                results[stage.name] = future.result()
+    return results
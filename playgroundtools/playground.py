@@ -1,15 +1,51 @@
+import hashlib
 import json
-
+import marshal
+import os
+import sys
+import time
+from argparse import Namespace
+from contextlib import nullcontext
+from glob import glob
+from pathlib import Path
+
+from .cache import get_cache_dir
+from .configdir import LazyConfig, is_config_dir, write_config_dir
 from .exceptions import (
     PGConfigNotFoundError,
     PGDoesNotExistError,
     PGInvalidConfError,
+    PGInvalidEditError,
+    PGInvalidManifestError,
+    PGInvalidPathError,
     PGInvalidSettingError,
     PGJSONFormatError,
+    PGNameNotEnteredError,
     PGSettingsNotFoundError,
+    PGTypeNotEnteredError,
+)
+from .query import delete_path, patch, query, set_path
+from .resources import load_file_resource
+from .template import get_template
+from .util import (
+    format_dict,
+    get_data_dir,
+    get_full_path,
+    write_atomic,
 )
-from .resources import load_file_resource, load_text_resource
-from .util import delete_key, format_dict, get_full_path, get_key, set_key
+
+# The file which records the files and folders created in a playground
+STATE_FILE = ".playground.json"
+
+# Overrides the location of the configuration file
+CONFIG_ENV = "PLAYGROUNDTOOLS_CONFIG"
+
+# Files modified within this time (in nanoseconds) of being cached are
+# compared by content
+RACY_TIME = 2_000_000_000
+
+# The JSON Patch operations accepted by 'config apply'
+PATCH_OPS = ("add", "replace", "remove")
 
 
 def load_json(name, input):
@@ -29,7 +65,7 @@ def format_config(config, custom, args):
     This function replaces format strings within the configuration with their
     appropriate values so that playground creation can proceed."""
     format_map = {"name": args.name, **custom}
-    return format_dict(config, format_map)
+    return get_template(config).render(format_map)
 
 
 def get_options(custom_format, args):
@@ -48,25 +84,165 @@ def get_playground_dir(args):
     return playground_dir
 
 
+def get_config_path():
+    """Returns a context manager for the path of the configuration.
+
+    The configuration is either a file or a directory of per-type files (see
+    the configdir module). Another file or directory can be given by the
+    PLAYGROUNDTOOLS_CONFIG environment variable; otherwise, the configuration
+    directory in the data directory is used if it exists, and the package's
+    config.json if not."""
+    config_path = os.environ.get(CONFIG_ENV)
+    if config_path:
+        return nullcontext(Path(config_path).resolve())
+    config_dir = get_config_dir()
+    if is_config_dir(config_dir):
+        return nullcontext(config_dir)
+    return load_file_resource("config.json")
+
+
+def get_config_dir():
+    """Retrieve the default location of a configuration directory."""
+    return get_data_dir() / "config"
+
+
 def get_config():
-    """Get the configuration for the package."""
+    """Get the configuration for the package.
+
+    A configuration directory is returned as a LazyConfig, which only reads
+    the types that are used."""
     try:
-        config_json = load_text_resource("config.json")
-        return load_json("config.json", config_json)
+        with get_config_path() as config_path:
+            if config_path.is_dir():
+                return LazyConfig(config_path)
+            return load_config(config_path)
     except FileNotFoundError:
         raise PGConfigNotFoundError
 
 
+def load_config(config_path):
+    """Returns the JSON-decoded configuration at 'config_path'.
+
+    The decoded configuration is cached in the data directory and reused for
+    as long as the file is unchanged. A file modified shortly before the
+    cache was written may have been modified again without changing its
+    timestamp, so its content is compared as well."""
+    stat = config_path.stat()
+    key = (str(config_path), stat.st_mtime_ns, stat.st_size)
+    cache_path = get_config_cache_path()
+    cached = read_config_cache(cache_path)
+    if cached:
+        cached_key, cached_digest, cached_at, cached_config = cached
+        if cached_key == key and stat.st_mtime_ns < cached_at - RACY_TIME:
+            return cached_config
+
+    content = config_path.read_bytes()
+    digest = hashlib.sha1(content).digest()
+    if cached and cached_digest == digest:
+        config = cached_config
+    else:
+        config = load_json("config.json", content.decode())
+    write_config_cache(cache_path, (key, digest, time.time_ns(), config))
+    return config
+
+
+def get_config_cache_path():
+    """Retrieve the path of the cached configuration."""
+    cache_tag = sys.implementation.cache_tag
+    return get_data_dir() / f"config.{cache_tag}.cache"
+
+
+def read_config_cache(cache_path):
+    """Returns the contents of the config cache, if it is readable."""
+    try:
+        return marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_config_cache(cache_path, cached):
+    """Replaces the contents of the config cache."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(marshal.dumps(cached))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
 def set_config(config):
     """Sets the config to the input specified."""
+    if isinstance(config, LazyConfig):
+        return config.save()
     try:
-        with load_file_resource("config.json") as config_path:
-            with open(config_path, "w") as f:
-                json.dump(config, f, indent=4)
+        with get_config_path() as config_path:
+            if config_path.is_dir():
+                return write_config_dir(config, config_path)
+            write_atomic(config_path, json.dumps(config, indent=4))
     except FileNotFoundError:
         raise PGConfigNotFoundError
 
 
+def get_manifest(manifest):
+    """Retrieve the playground entries listed in a manifest file.
+
+    A manifest is a JSON list of objects, each with the 'name', 'type', 'lib'
+    and 'options' of a playground to create."""
+    file_path = get_full_path(manifest)
+    with open(file_path) as f:
+        entries = load_json(file_path, f.read())
+    if not isinstance(entries, list):
+        raise PGInvalidManifestError(file_path, "expected a list of entries")
+    for index, entry in enumerate(entries):
+        error = check_entry(entry)
+        if error:
+            raise PGInvalidManifestError(file_path, f"entry {index} {error}")
+    return entries
+
+
+def check_entry(entry):
+    """Returns what is wrong with a manifest entry, or None if it is valid."""
+    if not isinstance(entry, dict):
+        return "is not an object"
+    for key in ["name", "type"]:
+        if not isinstance(entry.get(key, ""), str):
+            return f"has a '{key}' which is not a string"
+    lib = entry.get("lib", [])
+    if not isinstance(lib, list) or not all(isinstance(x, str) for x in lib):
+        return "has a 'lib' which is not a list of strings"
+    if not isinstance(entry.get("options", {}), (str, dict)):
+        return "has 'options' which are not an object"
+    return None
+
+
+def get_entry_args(entry, verbose=0):
+    """Returns arguments for the new command from a manifest entry."""
+    options = entry.get("options")
+    if options is not None and not isinstance(options, str):
+        options = json.dumps(options)
+    return Namespace(
+        command="new",
+        name=entry.get("name"),
+        type=entry.get("type"),
+        lib=entry.get("lib", []),
+        verbose=verbose,
+        options=options,
+    )
+
+
+def get_state(playground_dir):
+    """Retrieve the files and folders a playground was last created with.
+
+    An empty state is returned for playgrounds without a state file."""
+    state_path = playground_dir / STATE_FILE
+    try:
+        with open(state_path) as f:
+            return load_json(state_path, f.read())
+    except FileNotFoundError:
+        return {"files": {}, "folders": []}
+
+
 def get_settings(playground_dir):
     """Retrieve the settings for a given playground."""
     settings_path = playground_dir / "settings.json"
@@ -86,6 +262,8 @@ def clean_config(args, raw_config={}):
         "new": clean_config_new,
         "delete": clean_config_delete,
         "run": clean_config_run,
+        "list": clean_config_list,
+        "cache": clean_config_cache,
         "config": clean_config_config,
     }
     params = [args]
@@ -96,24 +274,32 @@ def clean_config(args, raw_config={}):
 
 def clean_config_new(args, raw_config):
     """Cleans the configuration for the new command."""
+    if not args.name:
+        raise PGNameNotEnteredError
+    if not args.type:
+        raise PGTypeNotEnteredError
     try:
         type_config = raw_config[args.type]
     except KeyError:
         raise PGInvalidConfError(args.type)
+    custom_format = type_config.get("format", {})
+    options = get_options(custom_format, args)
+    formatted = format_config(type_config, options, args)
     try:
-        lib = type_config["lib"] + args.lib
-        cleaned = {
+        format_map = {"name": args.name, **options}
+        lib = formatted["lib"] + format_dict(args.lib, format_map)
+        return {
             "dir": get_full_path(args.name),
             "verbosity": args.verbose,
-            "folders": type_config["folders"] + ["requirements"],
+            "folders": formatted["folders"] + ["requirements"],
             "files": {
-                **type_config["files"],
+                **formatted["files"],
                 "requirements/requirements.in": lib,
             },
             "lib": lib,
             "settings": {
-                "module": type_config["module"],
-                "args": type_config["args"],
+                "module": formatted["module"],
+                "args": formatted["args"],
             },
         }
     except KeyError as err:
@@ -121,10 +307,6 @@ def clean_config_new(args, raw_config):
         key = ".".join(keys)
         raise PGInvalidConfError(key)
 
-    custom_format = type_config.get("format", {})
-    options = get_options(custom_format, args)
-    return format_config(cleaned, options, args)
-
 
 def clean_config_run(args):
     """Cleans the configuration for the run command."""
@@ -144,8 +326,48 @@ def clean_config_run(args):
 
 
 def clean_config_delete(args):
-    """Cleans the configuration for the delete command."""
-    return {"dir": get_playground_dir(args)}
+    """Cleans the configuration for the delete command.
+
+    Names may be glob patterns, which only match playgrounds (folders with a
+    settings file)."""
+    names = args.name if isinstance(args.name, list) else [args.name]
+    dirs = []
+    for name in names:
+        if any(char in name for char in "*?["):
+            matches = [
+                get_full_path(match)
+                for match in sorted(glob(name))
+                if Path(match, "settings.json").exists()
+            ]
+            if not matches:
+                raise PGDoesNotExistError(name)
+            dirs.extend(matches)
+        else:
+            dirs.append(get_playground_dir(Namespace(name=name)))
+    return {
+        "dirs": list(dict.fromkeys(dirs)),
+        "wait": getattr(args, "wait", False),
+    }
+
+
+def clean_config_list(args):
+    """Cleans the configuration for the list command."""
+    return {
+        "type": args.type,
+        "name": args.name,
+        "sort": args.sort,
+        "reverse": args.reverse,
+        "json": args.json,
+    }
+
+
+def clean_config_cache(args):
+    """Cleans the configuration for the cache command."""
+    return {
+        "dir": get_cache_dir(),
+        "prune": args.subcommand == "prune",
+        "size": getattr(args, "size", None),
+    }
 
 
 def clean_config_config(args, raw_config):
@@ -154,6 +376,8 @@ def clean_config_config(args, raw_config):
     subcommands = {
         "delete": clean_config_conf_delete,
         "set": clean_config_conf_set,
+        "migrate": clean_config_conf_migrate,
+        "apply": clean_config_conf_apply,
     }
     func = subcommands.get(args.subcommand, clean_config_conf_read)
     return func(args, new_config)
@@ -162,18 +386,17 @@ def clean_config_config(args, raw_config):
 def clean_config_conf_delete(args, config):
     """Cleans the configuration for the config delete command."""
     cleaned = config
-    try:
-        if args.key:
-            keys = args.key.split(".")
-            config = delete_key(keys, config)
-        elif args.file:
-            file_path = get_full_path(args.file)
-            with open(file_path) as f:
-                custom_config = load_json(file_path, f.read())
-            for key in custom_config:
+    if args.key:
+        query_config(delete_path, args.key, cleaned)
+    elif args.file:
+        file_path = get_full_path(args.file)
+        with open(file_path) as f:
+            custom_config = load_json(file_path, f.read())
+        for key in custom_config:
+            try:
                 del cleaned[key]
-    except KeyError:
-        raise PGInvalidConfError(args.type)
+            except KeyError:
+                raise PGInvalidConfError(key)
     return cleaned
 
 
@@ -181,9 +404,8 @@ def clean_config_conf_set(args, config):
     """Cleans the configuration for the config set command."""
     cleaned = config
     if args.key:
-        keys = args.key.split(".")
         value = load_json("input", args.value)
-        set_key(keys, value, cleaned)
+        query_config(set_path, args.key, value, cleaned)
     elif args.file:
         file_path = get_full_path(args.file)
         with open(file_path) as f:
@@ -192,14 +414,69 @@ def clean_config_conf_set(args, config):
     return cleaned
 
 
+def clean_config_conf_apply(args, config):
+    """Cleans the configuration for the config apply command.
+
+    All of the edits are applied to the configuration in memory, so either
+    all of them or none of them are saved."""
+    if args.file and args.file != "-":
+        file_path = get_full_path(args.file)
+        with open(file_path) as f:
+            edits = load_json(file_path, f.read())
+    else:
+        edits = load_json("input", sys.stdin.read())
+    if not isinstance(edits, list):
+        raise PGInvalidEditError("expected a list of edits")
+    for edit in edits:
+        apply_edit(edit, config)
+    return config
+
+
+def apply_edit(edit, config):
+    """Apply a single edit to the configuration.
+
+    An edit is either a set or delete operation with a key in the form
+    {type}.{key}, or a JSON Patch add, replace or remove operation with a
+    path (a JSON Pointer), which follows RFC 6902."""
+    try:
+        op = edit["op"]
+        value = edit["value"] if op in ("set", "add", "replace") else None
+        path = edit["path"] if op in PATCH_OPS else edit["key"]
+    except (KeyError, TypeError, AttributeError):
+        raise PGInvalidEditError(json.dumps(edit))
+    if op in PATCH_OPS:
+        query_config(patch, path, op, value, config)
+    elif op == "set":
+        query_config(set_path, path, value, config)
+    elif op == "delete":
+        query_config(delete_path, path, config)
+    else:
+        raise PGInvalidEditError(f"unknown operation {op!r}")
+
+
+def query_config(func, path, *args):
+    """Call a function of the query module on a configuration path.
+
+    Errors are raised as the package's exceptions."""
+    try:
+        return func(path, *args)
+    except ValueError:
+        raise PGInvalidPathError(path)
+    except (KeyError, TypeError):
+        raise PGInvalidConfError(path)
+
+
+def clean_config_conf_migrate(args, config):
+    """Cleans the configuration for the config migrate command."""
+    config_dir = getattr(args, "dir", None)
+    return {
+        "config": config,
+        "dir": get_full_path(config_dir) if config_dir else get_config_dir(),
+    }
+
+
 def clean_config_conf_read(args, config):
     """Cleans the configuration for the config command with no args."""
-    cleaned = config
     if args.read:
-        keys = args.read.split(".")
-        try:
-            value = get_key(keys, cleaned)
-        except KeyError:
-            raise PGInvalidConfError(args.read)
-        cleaned = {"value": value}
-    return cleaned
+        return {"value": query_config(query, args.read, config)}
+    return dict(config)
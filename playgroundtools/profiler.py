@@ -0,0 +1,96 @@
+"""Module to profile a playground's module within its own interpreter.
+
+The playground's interpreter may not have this package installed, so this
+module is run by its path and only uses the standard library. It runs the
+module under cProfile ('cpu') or tracemalloc ('memory'), saves the result in
+the playground's profiles folder, and prints the top entries."""
+import os
+import sys
+import time
+from pathlib import Path
+
+PROFILES_DIR = "profiles"
+PROFILE_MODES = {"cpu": ".prof", "memory": ".tracemalloc"}
+PROFILE_TOP = 20
+TRACEBACK_LIMIT = 25
+
+
+def get_profile_argv(python, module, args, mode, playground_dir, top=None):
+    """Creates a list of arguments to profile a playground's module."""
+    profiles_dir = Path(playground_dir) / PROFILES_DIR
+    profiles_dir.mkdir(exist_ok=True)
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    profile_path = profiles_dir / f"{module}-{timestamp}{PROFILE_MODES[mode]}"
+    top = top or PROFILE_TOP
+    return [
+        str(python),
+        os.path.abspath(__file__),
+        mode,
+        str(profile_path),
+        str(top),
+        module,
+        *args,
+    ]
+
+
+def profile_cpu(run, profile_path, top):
+    """Run 'run' under cProfile, printing the most expensive functions."""
+    import cProfile
+    import pstats
+
+    profile = cProfile.Profile()
+    try:
+        profile.runcall(run)
+    finally:
+        profile.dump_stats(profile_path)
+        stats = pstats.Stats(profile, stream=sys.stderr)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        print(f"Profile saved to {profile_path}", file=sys.stderr)
+
+
+def profile_memory(run, profile_path, top):
+    """Run 'run' under tracemalloc, printing the largest allocations."""
+    import tracemalloc
+
+    tracemalloc.start(TRACEBACK_LIMIT)
+    result = None
+    try:
+        # Keep the module's globals alive until the snapshot is taken
+        result = run()
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, "<frozen *>"),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+        snapshot.dump(profile_path)
+        del result
+        print(f"Peak traced memory: {peak / 1024:.1f} KiB", file=sys.stderr)
+        for stat in snapshot.statistics("lineno")[:top]:
+            print(stat, file=sys.stderr)
+        print(f"Profile saved to {profile_path}", file=sys.stderr)
+
+
+def main():
+    """Profile the module given on the command line."""
+    import runpy
+
+    mode, profile_path, top, module, *args = sys.argv[1:]
+    # Run the module as 'python -m' would, from the playground's folder
+    sys.argv = [module, *args]
+    sys.path[0] = os.getcwd()
+    profile = profile_cpu if mode == "cpu" else profile_memory
+    profile(
+        lambda: runpy.run_module(module, run_name="__main__", alter_sys=True),
+        profile_path,
+        int(top),
+    )
+
+
+if __name__ == "__main__":
+    main()
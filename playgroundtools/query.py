@@ -0,0 +1,238 @@
+"""Module to query and modify configurations with path expressions.
+
+A path is a series of keys separated by dots, such as 'api.files'. List items
+are selected by index ('api.lib[0]'), and '*' matches every key or list item
+at its level ('*.lib[0]'), so one path can query every playground type at
+once. Dots, brackets, asterisks and backslashes within keys are escaped with
+a backslash ('api.files.main\\.py'). Paths are compiled once and cached.
+
+JSON Patch operations, which refer to values by JSON Pointer ('/api/lib/0'),
+are also supported."""
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+
+TOKEN = re.compile(
+    r"(?P<key>(?:\\.|[^.\[\]\\])+)|\[(?P<index>\*|-?\d+)\]|(?P<dot>\.)"
+)
+ESCAPE = re.compile(r"\\(.)")
+SPECIAL = re.compile(r"([.\[\]*\\])")
+MAX_CACHED = 256
+
+# The kinds of segments in a compiled path
+KEY = "key"
+INDEX = "index"
+WILDCARD = "wildcard"
+
+
+@lru_cache(maxsize=MAX_CACHED)
+def compile_path(path):
+    """Returns the segments of a path as a tuple of (kind, value) pairs.
+
+    A ValueError is raised if the path is malformed."""
+    segments = []
+    position = 0
+    expect_key = True
+    for match in TOKEN.finditer(path):
+        if match.start() != position:
+            break
+        if match["dot"]:
+            if expect_key:
+                break
+            expect_key = True
+        elif match["key"]:
+            if not expect_key:
+                break
+            if match["key"] == "*":
+                segments.append((WILDCARD, None))
+            else:
+                segments.append((KEY, ESCAPE.sub(r"\1", match["key"])))
+            expect_key = False
+        else:
+            if expect_key and segments:
+                break
+            if match["index"] == "*":
+                segments.append((WILDCARD, None))
+            else:
+                segments.append((INDEX, int(match["index"])))
+            expect_key = False
+        position = match.end()
+    if position != len(path) or expect_key:
+        raise ValueError(f"Invalid path: {path!r}")
+    return tuple(segments)
+
+
+def has_wildcard(path):
+    """Check whether a path can match more than one value."""
+    return any(kind == WILDCARD for kind, _ in compile_path(path))
+
+
+def format_path(keys):
+    """Returns the path of a list of keys (strings) and list indices."""
+    parts = []
+    for key in keys:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        else:
+            if parts:
+                parts.append(".")
+            parts.append(SPECIAL.sub(r"\\\1", key))
+    return "".join(parts)
+
+
+def get_children(value, kind, key):
+    """Returns the (key, child) pairs of a value matched by a segment."""
+    if kind == WILDCARD:
+        if isinstance(value, Mapping):
+            return list(value.items())
+        if isinstance(value, list):
+            return list(enumerate(value))
+        return []
+    if isinstance(value, list):
+        if kind == KEY and key.isdigit():
+            key = int(key)
+        if isinstance(key, int) and -len(value) <= key < len(value):
+            return [(key % len(value), value[key])]
+    elif kind == KEY and isinstance(value, Mapping) and key in value:
+        return [(key, value[key])]
+    return []
+
+
+def walk(segments, config, strict=True):
+    """Returns the (keys, value) pairs of the values matched by segments.
+
+    The segments are applied to every match of the previous segments in
+    turn, so the configuration is only walked once. If 'strict' is set, a
+    KeyError is raised when nothing matches."""
+    matches = [((), config)]
+    for kind, key in segments:
+        matches = [
+            ((*keys, child_key), child)
+            for keys, value in matches
+            for child_key, child in get_children(value, kind, key)
+        ]
+        if strict and not matches:
+            raise KeyError(key)
+    return matches
+
+
+def find(path, config):
+    """Returns the (keys, value) pairs of the values matched by a path.
+
+    Without wildcards, a KeyError is raised if the path doesn't exist."""
+    return walk(compile_path(path), config, not has_wildcard(path))
+
+
+def query(path, config):
+    """Returns the value at a path.
+
+    For paths with wildcards, a dictionary mapping the path of each match to
+    its value is returned instead."""
+    matches = find(path, config)
+    if has_wildcard(path):
+        return {format_path(keys): value for keys, value in matches}
+    return matches[0][1]
+
+
+def set_path(path, value, config):
+    """Set the values at a path, returning how many were set.
+
+    Missing keys are added to dictionaries, but list items must exist."""
+    *segments, (kind, key) = compile_path(path)
+    strict = not has_wildcard(path)
+    count = 0
+    for _, parent in walk(segments, config, strict):
+        if kind == KEY and isinstance(parent, Mapping):
+            parent[key] = value
+            count += 1
+            continue
+        for child_key, _ in get_children(parent, kind, key):
+            parent[child_key] = value
+            count += 1
+    if strict and not count:
+        raise KeyError(path)
+    return count
+
+
+def delete_path(path, config):
+    """Delete the values at a path, returning how many were deleted."""
+    *segments, (kind, key) = compile_path(path)
+    strict = not has_wildcard(path)
+    count = 0
+    for _, parent in walk(segments, config, strict):
+        child_keys = [child for child, _ in get_children(parent, kind, key)]
+        if isinstance(parent, list):
+            # Delete list items from the end, so the indices stay valid
+            child_keys.sort(reverse=True)
+        for child_key in child_keys:
+            del parent[child_key]
+            count += 1
+    if strict and not count:
+        raise KeyError(path)
+    return count
+
+
+def parse_pointer(pointer):
+    """Returns the keys of a JSON Pointer, such as '/api/lib/0'.
+
+    A ValueError is raised if the pointer is malformed or refers to the whole
+    configuration."""
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid pointer: {pointer!r}")
+    return [
+        key.replace("~1", "/").replace("~0", "~")
+        for key in pointer.split("/")[1:]
+    ]
+
+
+def get_pointer_index(key):
+    """Returns the list index a key of a JSON Pointer refers to."""
+    if not key.isdigit() or (key != "0" and key.startswith("0")):
+        raise ValueError(f"Invalid list index: {key!r}")
+    return int(key)
+
+
+def get_pointer_child(value, key):
+    """Returns the child of a value at a key of a JSON Pointer."""
+    if isinstance(value, list):
+        index = get_pointer_index(key)
+        if index >= len(value):
+            raise KeyError(key)
+        return value[index]
+    if isinstance(value, Mapping):
+        return value[key]
+    raise KeyError(key)
+
+
+def patch(pointer, op, value, config):
+    """Apply a JSON Patch add, replace or remove operation (RFC 6902).
+
+    'add' inserts into lists ('-' appends) and sets keys of dictionaries,
+    while 'replace' and 'remove' raise a KeyError if the target is missing."""
+    *keys, key = parse_pointer(pointer)
+    parent = config
+    for parent_key in keys:
+        parent = get_pointer_child(parent, parent_key)
+
+    if isinstance(parent, list):
+        if op == "add" and key == "-":
+            index = len(parent)
+        else:
+            index = get_pointer_index(key)
+        if index > len(parent) or (op != "add" and index == len(parent)):
+            raise KeyError(key)
+        if op == "add":
+            parent.insert(index, value)
+        elif op == "replace":
+            parent[index] = value
+        else:
+            del parent[index]
+    elif isinstance(parent, Mapping):
+        if op != "add" and key not in parent:
+            raise KeyError(key)
+        if op == "remove":
+            del parent[key]
+        else:
+            parent[key] = value
+    else:
+        raise KeyError(key)
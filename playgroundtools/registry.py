@@ -0,0 +1,138 @@
+"""Module to keep track of playgrounds in a local database.
+
+The registry is maintained by the commands which create, run and delete
+playgrounds, so listing playgrounds does not require walking the
+filesystem."""
+import time
+from contextlib import contextmanager
+
+from .util import get_data_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playgrounds (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT,
+    python TEXT,
+    created REAL,
+    last_run REAL,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS playgrounds_name ON playgrounds (name);
+CREATE INDEX IF NOT EXISTS playgrounds_type ON playgrounds (type);
+CREATE TABLE IF NOT EXISTS trash (path TEXT PRIMARY KEY);
+"""
+COLUMNS = ["name", "path", "type", "python", "created", "last_run", "size"]
+
+
+def get_registry_path():
+    """Retrieve the path of the registry database."""
+    return get_data_dir() / "registry.db"
+
+
+@contextmanager
+def connect(registry_path=None):
+    """Open the registry, committing any changes made on exit."""
+    import sqlite3
+
+    registry_path = registry_path or get_registry_path()
+    registry_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(registry_path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            yield connection
+    finally:
+        connection.close()
+
+
+def register(playground_dir, type, python, size=None):
+    """Add a playground to the registry.
+
+    A playground which is already registered keeps its creation and run
+    times."""
+    with connect() as connection:
+        connection.execute(
+            "INSERT INTO playgrounds "
+            "(path, name, type, python, created, size) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET "
+            "type = excluded.type, "
+            "python = excluded.python, "
+            "size = excluded.size",
+            (
+                str(playground_dir),
+                playground_dir.name,
+                type,
+                str(python),
+                time.time(),
+                size,
+            ),
+        )
+
+
+def unregister(playground_dir):
+    """Remove a playground from the registry."""
+    with connect() as connection:
+        connection.execute(
+            "DELETE FROM playgrounds WHERE path = ?", (str(playground_dir),)
+        )
+
+
+def touch(playground_dir):
+    """Record that a playground was run."""
+    with connect() as connection:
+        connection.execute(
+            "UPDATE playgrounds SET last_run = ? WHERE path = ?",
+            (time.time(), str(playground_dir)),
+        )
+
+
+def get_playgrounds(type=None, name=None, sort="name", reverse=False):
+    """Returns the registered playgrounds as a list of dictionaries.
+
+    Playgrounds can be filtered by 'type' and by a glob pattern matching
+    their 'name', and are sorted by the 'sort' column."""
+    if sort not in COLUMNS:
+        raise ValueError(f"Invalid column: {sort}")
+    query = f"SELECT {', '.join(COLUMNS)} FROM playgrounds"
+    conditions = []
+    params = []
+    if type:
+        conditions.append("type = ?")
+        params.append(type)
+    if name:
+        conditions.append("name GLOB ?")
+        params.append(name)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    order = "DESC" if reverse else "ASC"
+    query += f" ORDER BY {sort} {order}, path {order}"
+
+    with connect() as connection:
+        rows = connection.execute(query, params).fetchall()
+    return [dict(row) for row in rows]
+
+
+def add_trash(trash_dir):
+    """Record a trash directory which contains folders to be removed."""
+    with connect() as connection:
+        connection.execute(
+            "INSERT OR IGNORE INTO trash (path) VALUES (?)", (str(trash_dir),)
+        )
+
+
+def remove_trash(trash_dir):
+    """Forget a trash directory once it has been removed."""
+    with connect() as connection:
+        connection.execute(
+            "DELETE FROM trash WHERE path = ?", (str(trash_dir),)
+        )
+
+
+def get_trash():
+    """Returns the paths of the recorded trash directories."""
+    with connect() as connection:
+        rows = connection.execute("SELECT path FROM trash").fetchall()
+    return [row["path"] for row in rows]
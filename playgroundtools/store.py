@@ -0,0 +1,138 @@
+"""Module to share the files of playgrounds through a content-addressed store.
+
+Each distinct file is written to the store once, named by the hash of its
+content, and cloned into playgrounds. Clones (reflinks) share their data with
+the stored file until either is modified, so they take no extra space, but
+each playground's files are still separate and can be edited freely. Where
+the filesystem doesn't support cloning, the store would only add a copy, so
+files are written directly instead."""
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from .util import get_data_dir, hash_text
+
+# The ioctl request for cloning a file on Linux (FICLONE)
+FICLONE = 0x40049409
+
+# Whether each store (and its filesystem) supports cloning files
+_reflink_support = {}
+
+
+def get_store_dir():
+    """Retrieve the directory of the file store."""
+    return get_data_dir() / "store"
+
+
+def add_blob(text, store_dir=None):
+    """Add a file's text to the store, returning the path to its blob."""
+    store_dir = store_dir or get_store_dir()
+    digest = hash_text(text)
+    blob_path = store_dir / digest[:2] / digest[2:]
+    if blob_path.exists():
+        return blob_path
+
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(f"{blob_path}.{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, blob_path)
+    return blob_path
+
+
+def link_text(text, file_path, store_dir=None):
+    """Write a file's text to 'file_path' by cloning it from the store.
+
+    If the file can't be cloned from the store, it is written directly."""
+    store_dir = store_dir or get_store_dir()
+    if not can_reflink(store_dir, file_path.parent):
+        with open(file_path, "w") as f:
+            f.write(text)
+        return
+    blob_path = add_blob(text, store_dir)
+    try:
+        link_blob(blob_path, file_path)
+    except FileNotFoundError:
+        if blob_path.exists():
+            raise
+        # The blob was pruned after it was found in the store
+        link_blob(add_blob(text, store_dir), file_path)
+
+
+def can_reflink(store_dir, folder):
+    """Check whether files in the store can be cloned into 'folder'.
+
+    Files can only be cloned within a filesystem, and whether it supports
+    cloning is checked once per store by cloning a probe file."""
+    store_dir.mkdir(parents=True, exist_ok=True)
+    store_dev = store_dir.stat().st_dev
+    if folder.stat().st_dev != store_dev:
+        return False
+    key = (str(store_dir), store_dev)
+    if key not in _reflink_support:
+        _reflink_support[key] = probe_reflink(store_dir)
+    return _reflink_support[key]
+
+
+def probe_reflink(store_dir):
+    """Check whether a file in 'store_dir' can be cloned."""
+    probe_path = store_dir / f"probe.{os.getpid()}"
+    clone_path = Path(f"{probe_path}.clone")
+    try:
+        probe_path.write_bytes(b"probe")
+        reflink(probe_path, clone_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe_path.unlink(missing_ok=True)
+        clone_path.unlink(missing_ok=True)
+
+
+def link_blob(blob_path, file_path):
+    """Materialize a blob at 'file_path' as a separate, writable file.
+
+    The blob is cloned where possible, and copied otherwise."""
+    try:
+        return reflink(blob_path, file_path)
+    except OSError:
+        file_path.unlink(missing_ok=True)
+    shutil.copyfile(blob_path, file_path)
+
+
+def reflink(src, dst):
+    """Clone 'src' to 'dst', sharing their data until either is modified.
+
+    An OSError is raised if the platform or filesystem can't clone files."""
+    if sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0):
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(dst))
+        return
+    if sys.platform != "linux":
+        raise OSError(f"Cloning files is not supported on {sys.platform}")
+    import fcntl
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+
+
+def prune_store(store_dir=None):
+    """Remove the blobs in the store, returning how many were removed.
+
+    The files of playgrounds don't depend on the blobs they were cloned from,
+    so the store can be emptied at any time; blobs are added again as they
+    are needed."""
+    store_dir = store_dir or get_store_dir()
+    removed = 0
+    for blob_path in store_dir.glob("*/*"):
+        try:
+            blob_path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
@@ -0,0 +1,100 @@
+"""Module to compile and render format strings within configurations.
+
+Format strings (${string}) may appear anywhere within the keys and values of
+a configuration, including nested lists and dictionaries. A configuration is
+compiled once into a template, which can then be rendered against many
+format maps in a single pass."""
+import json
+import re
+
+PATTERN = re.compile(r"\$\{(?P<key>[^${}]*)\}")
+MAX_CACHED = 64
+
+_cache = {}
+
+
+class Template:
+    """Represents a configuration compiled for rendering."""
+
+    def __init__(self, unformatted):
+        self._render = compile_value(unformatted)
+
+    def render(self, format_map):
+        """Returns the configuration with its format strings replaced.
+
+        Format strings without a value in 'format_map' are left as is."""
+        return self._render(format_map)
+
+
+def get_template(unformatted):
+    """Returns the compiled template of a configuration.
+
+    Templates are cached by the content of the configuration, so rendering
+    the same configuration repeatedly only compiles it once, and changes to
+    it are never missed. Each template is compiled from its own copy of the
+    configuration."""
+    key = json.dumps(unformatted)
+    template = _cache.get(key)
+    if template:
+        return template
+    if len(_cache) >= MAX_CACHED:
+        _cache.clear()
+    template = _cache[key] = Template(json.loads(key))
+    return template
+
+
+def compile_value(value):
+    """Returns a function that renders 'value' against a format map."""
+    if type(value) is dict:
+        return compile_dict(value)
+    elif type(value) is list:
+        return compile_list(value)
+    elif type(value) is str:
+        return compile_str(value)
+    return lambda format_map: value
+
+
+def compile_dict(unformatted):
+    """Returns a function that renders a dictionary against a format map."""
+    items = [
+        (compile_str(key), compile_value(value))
+        for key, value in unformatted.items()
+    ]
+    return lambda format_map: {
+        render_key(format_map): render_value(format_map)
+        for render_key, render_value in items
+    }
+
+
+def compile_list(unformatted):
+    """Returns a function that renders a list against a format map."""
+    if not any(is_formatted(element) for element in unformatted):
+        return lambda format_map: list(unformatted)
+    elements = [compile_value(element) for element in unformatted]
+    return lambda format_map: [render(format_map) for render in elements]
+
+
+def compile_str(unformatted):
+    """Returns a function that renders a string against a format map."""
+    parts = PATTERN.split(unformatted)
+    if len(parts) == 1:
+        return lambda format_map: unformatted
+    literals = parts[::2]
+    keys = parts[1::2]
+
+    def render(format_map):
+        rendered = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            value = format_map.get(key)
+            rendered.append("${%s}" % key if value is None else str(value))
+            rendered.append(literal)
+        return "".join(rendered)
+
+    return render
+
+
+def is_formatted(value):
+    """Check whether 'value' could contain format strings."""
+    if type(value) is str:
+        return PATTERN.search(value) is not None
+    return type(value) in (dict, list)
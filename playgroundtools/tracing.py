@@ -0,0 +1,181 @@
+"""Module to record how long each stage of a command takes.
+
+While tracing is enabled, spans record the wall time, CPU time, and memory
+usage (as traced by tracemalloc) of the code they surround, along with any
+values annotated by that code (such as the number of bytes written). The
+spans can be exported in the Chrome trace event format, which can be viewed
+at chrome://tracing or https://ui.perfetto.dev."""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_tracer = None
+
+
+class Tracer:
+    """Collects spans as trace events.
+
+    Spans may run concurrently on several threads. The memory peak of a span
+    is the highest traced memory usage while it was running."""
+
+    def __init__(self, level=0):
+        import tracemalloc
+
+        self.level = level
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active = {}
+        self._threads = {}
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+
+    def get_timestamp(self):
+        """Returns the time since tracing started in microseconds."""
+        return (time.perf_counter() - self._start) * 1e6
+
+    def get_stack(self):
+        """Returns the arguments of the spans running on this thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def update_memory(self):
+        """Record the traced memory usage, returning its current value.
+
+        The peak since the last update is attributed to every running span.
+        This must be called with the lock held."""
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for args in self._active.values():
+            args["memory_peak"] = max(args["memory_peak"], peak)
+        self.events.append(
+            {
+                "name": "memory",
+                "ph": "C",
+                "ts": self.get_timestamp(),
+                "pid": os.getpid(),
+                "args": {"traced": current},
+            }
+        )
+        return current
+
+    @contextmanager
+    def span(self, name, category, level=0):
+        """Record a span around the body of the with statement.
+
+        The dictionary of the span's arguments is yielded, so values can be
+        added to it. Spans with a 'level' above the tracer's are skipped."""
+        if level > self.level:
+            yield {}
+            return
+        thread = threading.current_thread()
+        args = {"memory_peak": 0}
+        stack = self.get_stack()
+        stack.append(args)
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            args["memory_start"] = self.update_memory()
+            self._active[id(args)] = args
+        start = self.get_timestamp()
+        cpu_start = time.thread_time()
+        try:
+            yield args
+        finally:
+            args["cpu_time"] = time.thread_time() - cpu_start
+            end = self.get_timestamp()
+            stack.pop()
+            with self._lock:
+                args["memory_end"] = self.update_memory()
+                del self._active[id(args)]
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": start,
+                        "dur": end - start,
+                        "pid": os.getpid(),
+                        "tid": thread.ident,
+                        "args": args,
+                    }
+                )
+
+    def stop(self):
+        """Stop tracing, returning the recorded trace events."""
+        import tracemalloc
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": ident,
+                "args": {"name": name},
+            }
+            for ident, name in self._threads.items()
+        ]
+        return metadata + self.events
+
+
+def start_tracing(level=0):
+    """Start recording spans up to the given detail 'level'."""
+    global _tracer
+    _tracer = Tracer(level)
+
+
+def stop_tracing():
+    """Stop recording spans, returning the recorded trace events."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer.stop() if tracer else []
+
+
+def is_tracing():
+    """Check whether spans are being recorded."""
+    return _tracer is not None
+
+
+@contextmanager
+def span(name, category="stage", level=0):
+    """Record a span if tracing is enabled (see Tracer.span)."""
+    if _tracer is None:
+        yield {}
+        return
+    with _tracer.span(name, category, level) as args:
+        yield args
+
+
+def annotate(**values):
+    """Add values to the innermost span running on this thread."""
+    if _tracer is not None:
+        stack = _tracer.get_stack()
+        if stack:
+            stack[-1].update(values)
+
+
+def traced(func, name, category="stage", level=0):
+    """Returns a function which calls 'func' within a span."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name, category, level):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def write_trace(trace_path, events):
+    """Write trace events to a file in the Chrome trace event format."""
+    trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+    with open(trace_path, "w") as f:
+        json.dump(trace, f, indent=4)
@@ -0,0 +1,138 @@
+"""Module to delete folders quickly by moving them to a trash directory.
+
+Folders are renamed into a trash directory next to them, which is instant,
+and removed afterwards by a reaper that walks them on several threads. The
+trash directories are recorded in the registry so they can be reaped by a
+separate process."""
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from pathlib import Path
+from uuid import uuid4
+
+from .locks import lock_trash
+from .registry import add_trash, get_trash, remove_trash
+
+TRASH_NAME = ".playgroundtools-trash"
+REAP_WORKERS = 8
+
+
+def get_trash_dir(folder):
+    """Retrieve the trash directory for 'folder'.
+
+    The trash directory is on the same filesystem as the folder, so moving
+    the folder to it is a rename."""
+    return folder.parent / TRASH_NAME
+
+
+def move_to_trash(folder, locked=False):
+    """Move 'folder' to its trash directory, returning its new path.
+
+    If 'locked' is set, the caller already holds the trash lock."""
+    trash_dir = get_trash_dir(folder)
+    trash_path = trash_dir / f"{folder.name}.{uuid4().hex}"
+    while True:
+        with nullcontext() if locked else lock_trash():
+            trash_dir.mkdir(exist_ok=True)
+            add_trash(trash_dir)
+        try:
+            folder.rename(trash_path)
+            return trash_path
+        except FileNotFoundError:
+            if not os.path.lexists(folder):
+                raise
+            # A collector removed the (empty) trash directory in the meantime
+
+
+def reap(folder, max_workers=REAP_WORKERS):
+    """Remove 'folder' and its contents using several threads."""
+    folders = []
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = {executor.submit(clear_dir, folder)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subfolders = future.result()
+                folders.extend(subfolders)
+                pending.update(
+                    executor.submit(clear_dir, subfolder)
+                    for subfolder in subfolders
+                )
+
+    # Subfolders have longer paths than their parents, so they come first
+    folders.sort(key=len, reverse=True)
+    for path in [*folders, folder]:
+        try:
+            os.rmdir(path)
+        except FileNotFoundError:
+            continue
+
+
+def clear_dir(folder):
+    """Remove the files in 'folder', returning the paths of its subfolders."""
+    subfolders = []
+    try:
+        it = os.scandir(folder)
+    except FileNotFoundError:
+        return subfolders
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+    return subfolders
+
+
+def collect_garbage(max_workers=REAP_WORKERS):
+    """Reap everything in the known trash directories.
+
+    Folders moved to the trash while this runs are reaped as well. The number
+    of folders removed is returned."""
+    removed = 0
+    while True:
+        reaped = 0
+        for trash_dir in get_trash():
+            trash_dir = Path(trash_dir)
+            if trash_dir.exists():
+                for path in list(trash_dir.iterdir()):
+                    reap(path, max_workers)
+                    reaped += 1
+            remove_trash_dir(trash_dir)
+        removed += reaped
+        if not reaped:
+            return removed
+
+
+def remove_trash_dir(trash_dir):
+    """Remove a trash directory and its record if it is empty.
+
+    Returns whether it was removed (or was already gone)."""
+    with lock_trash():
+        try:
+            trash_dir.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # Something was moved to the trash after it was emptied
+            return False
+        remove_trash(trash_dir)
+    return True
+
+
+def spawn_collector():
+    """Start a separate process which reaps the trash directories."""
+    root_dir = Path(__file__).resolve().parents[__package__.count(".") + 1]
+    subprocess.Popen(
+        [sys.executable, "-m", __package__, "gc"],
+        cwd=root_dir,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
@@ -1,6 +1,11 @@
-import re
+import hashlib
+import os
 from pathlib import Path
-from shutil import rmtree
+from shutil import copymode, rmtree
+
+from .template import Template, compile_str
+
+DATA_DIR_ENV = "PLAYGROUNDTOOLS_DATA"
 
 
 def get_full_path(name):
@@ -8,6 +13,22 @@ def get_full_path(name):
     return Path(name).resolve()
 
 
+def get_data_dir():
+    """Retrieve the directory where the package keeps its own data.
+
+    The location can be overridden with the PLAYGROUNDTOOLS_DATA environment
+    variable."""
+    data_dir = os.environ.get(DATA_DIR_ENV)
+    if data_dir:
+        return Path(data_dir).resolve()
+    return Path.home() / ".playgroundtools"
+
+
+def get_staging_dir(playground_dir):
+    """Retrieve the directory a playground is built in before creation."""
+    return playground_dir.with_name(f".{playground_dir.name}.staging")
+
+
 def get_venv_dir(playground_dir):
     """Retrieve the virtual environment directory in a playground."""
     return playground_dir / ".venv"
@@ -22,50 +43,88 @@ def get_python_path(venv_path):
     return scripts_path / "python"
 
 
-def get_command(python, module, args):
-    """Creates a command from a path, module, and arguments."""
-    cmd = [str(python), "-m", module, *args]
-    return " ".join(cmd)
+def get_argv(python, module, args):
+    """Creates a list of arguments from a path, module, and arguments."""
+    return [str(python), "-m", module, *args]
 
 
-def remove_if_exists(folder):
-    """Remove 'folder' if it exists."""
-    if folder.exists():
-        rmtree(folder)
+def get_file_text(content):
+    """Returns the text of a file from a list of its lines."""
+    return "".join(f"{line}\n" for line in content)
+
+
+def hash_text(text):
+    """Returns the hash of a file's text, used to detect changes."""
+    return hashlib.sha1(text.encode()).hexdigest()
 
 
-def get_key(keys, config):
-    """Return the corresponding value of a key recursively.
+def hash_file(file_path):
+    """Returns the hash of a file's text, or None if it can't be read."""
+    try:
+        with open(file_path) as f:
+            return hash_text(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
 
-    The 'keys' argument is a list of dictionary keys, from outermost to
-    innermost."""
-    if not keys:
-        return config
-    return get_key(keys[1:], config[keys[0]])
 
+def get_dir_size(folder):
+    """Returns the total size (in bytes) of the files within 'folder'."""
+    size = 0
+    stack = [folder]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    size += entry.stat(follow_symlinks=False).st_size
+    return size
 
-def set_key(keys, value, config):
-    """Set the value of a key recursively.
 
-    The 'keys' argument is a list of dictionary keys, from outermost to
-    innermost."""
-    if len(keys) == 1:
-        config.update({keys[0]: value})
-        return config
-    key = config[keys[0]]
-    return set_key(keys[1:], value, key)
+def write_atomic(file_path, text):
+    """Replace the contents of a file atomically.
 
+    The text is written to a temporary file in the same folder, flushed to
+    disk, and renamed over the file, so the file is never seen partially
+    written, even if the process is interrupted."""
+    from tempfile import mkstemp
+
+    fd, tmp_path = mkstemp(
+        prefix=f".{file_path.name}.", suffix=".tmp", dir=file_path.parent
+    )
+    try:
+        with open(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if file_path.exists():
+            copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    sync_dir(file_path.parent)
+
+
+def sync_dir(folder):
+    """Flush the entries of a folder to disk, where this is supported."""
+    if os.name == "nt":
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-def delete_key(keys, config):
-    """Delete the value of a key recursively.
 
-    The 'keys' argument is a list of dictionary keys, from outermost to
-    innermost."""
-    if len(keys) == 1:
-        del config[keys[0]]
-        return config
-    key = config[keys[0]]
-    return delete_key(keys[1:], key)
+def remove_if_exists(folder):
+    """Remove 'folder' if it exists."""
+    if folder.exists():
+        rmtree(folder)
 
 
 def format_dict(unformatted, format_map):
@@ -74,31 +133,12 @@ def format_dict(unformatted, format_map):
     This function is responsible for the actual replacement of format strings
     (${string}) with their appropriate counterparts, given in the 'format_map'
     argument."""
-    if type(unformatted) is dict:
-        formatted = {}
-        for key in unformatted:
-            formatted_key = format_str(key, format_map)
-            formatted[formatted_key] = unformatted[key]
-
-            value = formatted[formatted_key]
-            formatted[formatted_key] = format_dict(value, format_map)
-    elif type(unformatted) is list:
-        formatted = []
-        for element in unformatted:
-            formatted.append(format_str(element, format_map))
-    elif type(unformatted) is str:
-        formatted = format_str(unformatted, format_map)
-    else:
-        formatted = unformatted
-    return formatted
+    return Template(unformatted).render(format_map)
 
 
 def format_str(unformatted, format_map):
     """Format a string based on a given map.
 
-    This function uses a regular expression to find format strings and replace
-    them with values specified in 'format_map'."""
-    pattern = re.compile(r"^\$\{(?P<key>)\}$")
-    return pattern.sub(
-        lambda matchobj: format_map.get(matchobj.group("key")), unformatted
-    )
+    Format strings (${string}) anywhere within 'unformatted' are replaced with
+    values specified in 'format_map'."""
+    return compile_str(unformatted)(format_map)
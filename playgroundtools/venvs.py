@@ -0,0 +1,176 @@
+"""Module to assist with creating virtual environments from templates.
+
+Creating a virtual environment with pip runs ensurepip from scratch, which is
+slow. Instead, a template environment is built once per interpreter and then
+cloned into each playground, with any hard-coded paths rewritten."""
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from .util import get_data_dir, get_python_path, remove_if_exists
+
+# The longest interpreter line most kernels will run (including the '#!')
+MAX_SHEBANG = 127
+# Scripts whose interpreter paths are too long or have spaces are run through
+# sh instead, as venv and pip write them
+SH_SHEBANG_START = b"#!/bin/sh\n'''exec' \""
+SH_SHEBANG_END = b"\n' '''\n"
+
+
+def create_venv(venv_path):
+    """Create a virtual environment at 'venv_path'.
+
+    The environment is cloned from the interpreter's template if possible;
+    otherwise, it is created from scratch."""
+    if os.name != "nt":
+        try:
+            template_path = get_template()
+            clone_venv(template_path, venv_path)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            remove_if_exists(venv_path)
+    import venv
+
+    venv.create(venv_path, with_pip=True)
+
+
+def get_template_dir():
+    """Retrieve the template directory for the running interpreter."""
+    executable = os.path.abspath(sys._base_executable)
+    digest = hashlib.sha1(executable.encode()).hexdigest()[:10]
+    name = f"{sys.implementation.cache_tag}-{digest}"
+    return get_data_dir() / "venvs" / name
+
+
+def get_template():
+    """Retrieve the template environment, building it if necessary."""
+    template_dir = get_template_dir()
+    template_path = template_dir / ".venv"
+    if is_template_valid(template_path):
+        return template_path
+
+    remove_if_exists(template_dir)
+    build_dir = template_dir.with_name(f"{template_dir.name}.{os.getpid()}")
+    build_path = build_dir / ".venv"
+    remove_if_exists(build_dir)
+    import venv
+
+    venv.create(build_path, with_pip=True)
+    # Relocate before publishing, so only finished templates are visible
+    relocate_venv(build_path, build_path, template_path)
+    try:
+        build_dir.rename(template_dir)
+    except OSError:
+        # Another process finished building the template first
+        remove_if_exists(build_dir)
+    return template_path
+
+
+def is_template_valid(template_path):
+    """Check whether a template was built by the running interpreter."""
+    cfg = read_venv_cfg(template_path)
+    home = os.path.dirname(os.path.abspath(sys._base_executable))
+    version = ".".join(str(part) for part in sys.version_info[:3])
+    python_path = get_python_path(template_path)
+    return (
+        cfg.get("home") == home
+        and cfg.get("version") == version
+        and python_path.exists()
+    )
+
+
+def read_venv_cfg(venv_path):
+    """Return the key-value pairs of an environment's pyvenv.cfg file."""
+    cfg = {}
+    try:
+        with open(venv_path / "pyvenv.cfg") as f:
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep:
+                    cfg[key.strip()] = value.strip()
+    except FileNotFoundError:
+        pass
+    return cfg
+
+
+def clone_venv(template_path, venv_path):
+    """Clone a template environment into 'venv_path'."""
+    shutil.copytree(
+        template_path, venv_path, symlinks=True, copy_function=link_or_copy
+    )
+    relocate_venv(venv_path, template_path, venv_path)
+
+
+def link_or_copy(src, dst):
+    """Hardlink 'src' to 'dst', falling back to a copy."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def relocate_venv(venv_path, old_path, new_path):
+    """Rewrite references to 'old_path' within an environment.
+
+    Only pyvenv.cfg and the scripts directory (shebangs and activation
+    scripts) contain absolute paths. Rewritten files are replaced rather than
+    modified, so hardlinked copies are left untouched."""
+    old = os.fsencode(old_path)
+    new = os.fsencode(new_path)
+    bin_path = get_python_path(venv_path).parent
+    paths = [venv_path / "pyvenv.cfg", *bin_path.iterdir()]
+    for path in paths:
+        if path.is_symlink() or not path.is_file():
+            continue
+        content = path.read_bytes()
+        if old not in content:
+            continue
+        replace_file(path, relocate_script(content, old, new))
+
+
+def relocate_script(content, old, new):
+    """Returns the content of a file with 'old' replaced by 'new'.
+
+    The interpreter line of a script is written again as a whole, so that it
+    still runs if the new path has spaces or is too long for the kernel."""
+    python, body = parse_shebang(content)
+    if python is None or not python.startswith(old):
+        return content.replace(old, new)
+    python = new + python.replace(old, b"", 1)
+    return get_shebang(python) + body.replace(old, new)
+
+
+def parse_shebang(content):
+    """Returns the interpreter of a script and the rest of its content.
+
+    The interpreter is None if the content doesn't start with a shebang."""
+    if content.startswith(SH_SHEBANG_START):
+        end = content.find(SH_SHEBANG_END)
+        if end != -1:
+            start = len(SH_SHEBANG_START)
+            python = content[start:end].partition(b'"')[0]
+            body_start = end + len(SH_SHEBANG_END)
+            return python, content[body_start:]
+    if content.startswith(b"#!"):
+        line, _, body = content.partition(b"\n")
+        return line[2:].strip(), body
+    return None, content
+
+
+def get_shebang(python):
+    """Returns the lines which run a script with the interpreter 'python'."""
+    if b" " not in python and len(python) + 2 <= MAX_SHEBANG:
+        return b"#!" + python + b"\n"
+    return SH_SHEBANG_START + python + b'" "$0" "$@"' + SH_SHEBANG_END
+
+
+def replace_file(path, content):
+    """Replace the file at 'path' with one containing 'content'."""
+    tmp_path = Path(f"{path}.tmp")
+    tmp_path.write_bytes(content)
+    shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
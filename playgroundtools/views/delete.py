@@ -21,7 +21,7 @@ class DeleteView:
         name_label = ttk.Label(self.input_frame, text="Name")
         name_label.grid(row=0, column=0, padx=5, pady=2, sticky="W")
         self.name = tk.StringVar()
-        self.name_field = ttk.Entry(
+        self.name_field = ttk.Combobox(
             self.input_frame, width=40, textvariable=self.name
         )
         self.name_field.grid(row=1, column=0, padx=5, pady=2, sticky="NSEW")
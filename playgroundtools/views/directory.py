@@ -3,12 +3,30 @@ from pathlib import Path
 from tkinter import ttk
 
 DIRECTORY_COLUMNS = {"path": "Path", "extension": "File Extension"}
+# Past this many paths, folders are only filled in when they are opened
+LAZY_THRESHOLD = 500
+
+
+def build_tree(paths):
+    """Returns the children of each item in a tree of paths.
+
+    Items are keyed by their full path (joined with '/'), and the root by ''.
+    Folders which only appear as the parents of other paths are added, and
+    the children of each item are sorted."""
+    tree = {"": []}
+    for parts in sorted({Path(path).parts for path in paths}):
+        for depth in range(1, len(parts) + 1):
+            key = "/".join(parts[:depth])
+            if key not in tree:
+                tree[key] = []
+                tree["/".join(parts[: depth - 1])].append(key)
+    return tree
 
 
 class DirectoryView:
     def __init__(self, parent):
         self._columns = DIRECTORY_COLUMNS
-        self._paths = {".": ""}
+        self._tree = {"": []}
 
         self.treeview = ttk.Treeview(
             parent, columns=list(self._columns.keys()), selectmode=tk.BROWSE
@@ -17,30 +35,55 @@ class DirectoryView:
         for column_id, heading in self._columns.items():
             self.treeview.heading(column_id, text=heading)
 
+        self.treeview.bind("<<TreeviewOpen>>", self._open_folder)
+
     def clear(self):
         children = self.treeview.get_children("")
-        self._paths = {".": ""}
+        self._tree = {"": []}
         self.treeview.delete(*children)
 
     def set_paths(self, paths):
+        """Shows a list of paths as a tree, replacing the current one."""
         self.clear()
-        for path in paths:
-            self.add_path(path)
-
-    def add_path(self, path):
-        path = Path(path)
-        parent = str(path.parent)
-        if parent in self._paths:
-            parent_id = self._paths[parent]
-            path_id = self.treeview.insert(
-                parent_id,
-                tk.END,
-                text=path.name,
-                values=self._format_columns(path),
-            )
-            self._paths[path.name] = path_id
-            return path_id
-        self.add_path(parent)
+        self._tree = build_tree(paths)
+        if len(self._tree) > LAZY_THRESHOLD:
+            self._insert_children("")
+            return
+        # Parents are always added to the tree before their children
+        for key in self._tree:
+            if key:
+                self._insert(key.rpartition("/")[0], key)
+
+    def _insert(self, parent_key, key):
+        self.treeview.insert(
+            parent_key,
+            tk.END,
+            iid=key,
+            text=key.rpartition("/")[2],
+            values=self._format_columns(Path(key)),
+        )
+
+    def _insert_children(self, parent_key):
+        """Inserts the children of an item, leaving their children out.
+
+        Folders get a placeholder child until they are opened, so that they
+        can still be expanded."""
+        for key in self._tree[parent_key]:
+            self._insert(parent_key, key)
+            if self._tree[key]:
+                self.treeview.insert(key, tk.END, iid=self._placeholder(key))
+
+    def _open_folder(self, event=None):
+        """Fills in the children of a folder when it is first opened."""
+        key = self.treeview.focus()
+        placeholder = self._placeholder(key)
+        if self.treeview.exists(placeholder):
+            self.treeview.delete(placeholder)
+            self._insert_children(key)
+
+    def _placeholder(self, key):
+        # Keys never end with a separator, so this can't be another item's
+        return f"{key}/"
 
     def _format_columns(self, path):
         return "/".join(path.parts), path.suffix
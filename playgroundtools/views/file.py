@@ -1,21 +1,52 @@
 import tkinter as tk
 
+CHUNK_SIZE = 16384  # characters inserted at a time
+CHUNK_INTERVAL = 1  # milliseconds between chunks
+
+
+def iter_chunks(text, size):
+    """Yields consecutive pieces of a string of at most 'size' characters."""
+    for start in range(0, len(text), size):
+        end = start + size
+        yield text[start:end]
+
 
 class FileView:
     """Represents the file preview section of the GUI."""
 
     def __init__(self, parent):
         self.parent = parent
+        self._pending = None
 
         self.textarea = tk.Text(self.parent)
 
         self.textarea.configure(state=tk.DISABLED)
 
     def set_text(self, text):
-        """Sets the text of the textarea."""
+        """Sets the text of the textarea.
+
+        The first chunk is shown immediately, and the rest are inserted in
+        the background so that large files don't freeze the window."""
         text = "\n".join(text)
         self.clear_text()
-        self.insert_text(1.0, text)
+        self._insert_chunks(iter_chunks(text, CHUNK_SIZE))
+
+    def _insert_chunks(self, chunks):
+        """Inserts the next chunk, scheduling the one after it."""
+        chunk = next(chunks, None)
+        if chunk is None:
+            self._pending = None
+            return
+        self.insert_text(tk.END, chunk)
+        self._pending = self.textarea.after(
+            CHUNK_INTERVAL, self._insert_chunks, chunks
+        )
+
+    def cancel(self):
+        """Cancels the insertion of the rest of the text."""
+        if self._pending is not None:
+            self.textarea.after_cancel(self._pending)
+            self._pending = None
 
     def insert_text(self, index, text):
         self.textarea.configure(state=tk.NORMAL)
@@ -24,6 +55,7 @@ class FileView:
 
     def clear_text(self):
         """Clears the text of the textarea."""
+        self.cancel()
         self.textarea.configure(state=tk.NORMAL)
         self.textarea.delete(1.0, tk.END)
         self.textarea.configure(state=tk.DISABLED)
@@ -14,3 +14,11 @@ def raw_config():
     with load_file_resource("config.json") as config_path:
         with open(config_path, "w") as f:
             f.write(result)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Keeps the package's data directory within a temporary directory."""
+    path = tmp_path / "data"
+    monkeypatch.setenv("PLAYGROUNDTOOLS_DATA", str(path))
+    yield path
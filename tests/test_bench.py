@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+from ..playgroundtools import bench
+from ..playgroundtools.exceptions import PGRunFailedError
+
+
+class TestBench:
+    """Tests functions in the bench module."""
+
+    def test_run_once(self, tmp_path):
+        argv = [sys.executable, "-c", "sum(range(100000))"]
+
+        usage = bench.run_once(argv, tmp_path)
+        assert usage["wall"] > 0
+        if hasattr(os, "wait4"):
+            assert usage["cpu"] > 0
+            assert usage["rss"] > 1024 * 1024
+
+    def test_run_once_failed(self, tmp_path):
+        argv = [sys.executable, "-c", "raise SystemExit(2)"]
+
+        with pytest.raises(PGRunFailedError) as err:
+            bench.run_once(argv, tmp_path)
+        assert err.value.args == (2,)
+
+    def test_summarize(self):
+        runs = [{"wall": wall, "cpu": None, "rss": 1} for wall in range(21)]
+
+        summary = bench.summarize(runs)
+        assert summary["wall"] == {
+            "min": 0,
+            "median": 10,
+            "p95": 19,
+            "max": 20,
+        }
+        assert summary["cpu"] is None
+        assert summary["rss"]["p95"] == 1
@@ -0,0 +1,75 @@
+import os
+import subprocess
+from argparse import Namespace
+
+import pytest
+
+from ..playgroundtools import cache, commands
+from ..playgroundtools.exceptions import PGInvalidEnvError
+from .fixtures import data_dir
+
+
+class TestCache:
+    """Tests functions in the cache module."""
+
+    def make_entry(self, cache_dir, name, size, last_used):
+        path = cache_dir / "wheels" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"0" * size)
+        os.utime(path, (last_used, last_used))
+        return path
+
+    def test_get_cache_info(self):
+        cache_dir = cache.get_cache_dir()
+        self.make_entry(cache_dir, "a.whl", 100, 1000)
+        self.make_entry(cache_dir, "b.whl", 50, 2000)
+
+        info = cache.get_cache_info()
+        assert info["files"] == 2
+        assert info["size"] == 150
+
+    def test_prune_cache(self):
+        cache_dir = cache.get_cache_dir()
+        megabyte = cache.MEGABYTE
+        oldest = self.make_entry(cache_dir, "a/a.whl", megabyte, 1000)
+        older = self.make_entry(cache_dir, "b/b.whl", megabyte, 2000)
+        newest = self.make_entry(cache_dir, "c/c.whl", megabyte, 3000)
+
+        assert cache.prune_cache(1) == 2 * megabyte
+        assert not oldest.exists() and not oldest.parent.exists()
+        assert not older.exists()
+        assert newest.exists()
+
+    def test_prune_cache_limit(self, monkeypatch):
+        cache_dir = cache.get_cache_dir()
+        path = self.make_entry(cache_dir, "a.whl", cache.MEGABYTE, 1000)
+
+        monkeypatch.setenv(cache.CACHE_SIZE_ENV, "1")
+        assert cache.prune_cache() == 0
+        assert path.exists()
+
+    @pytest.mark.parametrize("limit", ["2GB", "-1"])
+    def test_get_cache_limit_invalid(self, monkeypatch, limit):
+        monkeypatch.setenv(cache.CACHE_SIZE_ENV, limit)
+        with pytest.raises(PGInvalidEnvError):
+            cache.get_cache_limit()
+
+    def test_install_reqs_argv(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setenv("PLAYGROUNDTOOLS_DATA", str(tmp_path / "a b"))
+        monkeypatch.setattr(subprocess, "run", calls.append)
+
+        commands.install_reqs(tmp_path)
+        argv = calls[0]
+        assert argv[argv.index("--cache-dir") + 1] == str(
+            tmp_path / "a b" / "cache"
+        )
+
+    def test_cache_command(self):
+        cache_dir = cache.get_cache_dir()
+        path = self.make_entry(cache_dir, "a.whl", 100, 1000)
+
+        args = Namespace(command="cache", subcommand="prune", size=0)
+        info = commands.cache(args)
+        assert info["files"] == 0
+        assert not path.exists()
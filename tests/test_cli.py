@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+LAZY_MODULES = [
+    "tkinter",
+    "venv",
+    "sqlite3",
+    "webbrowser",
+    "multiprocessing",
+    "importlib.metadata",
+    "concurrent.futures",
+    "playgroundtools.bench",
+    "playgroundtools.trash",
+]
+
+
+class TestCli:
+    """Tests the startup of the CLI."""
+
+    def get_imported_modules(self):
+        """Returns the modules imported by a fresh interpreter for the CLI."""
+        code = (
+            "import json, sys; import playgroundtools.cli; "
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return set(json.loads(result.stdout))
+
+    def test_lazy_imports(self):
+        modules = self.get_imported_modules()
+        for module in LAZY_MODULES:
+            assert module not in modules
@@ -1,19 +1,28 @@
+import io
 import json
 import os
+import sys
 import venv
 from argparse import Namespace
+from copy import deepcopy
 from pathlib import Path
 
 import pytest
 
-from ..playgroundtools import commands
+from ..playgroundtools import commands, registry
 from ..playgroundtools.exceptions import (
     PGDoesNotExistError,
     PGInvalidConfError,
+    PGInvalidManifestError,
+    PGInvalidOptionError,
     PGJSONFormatError,
+    PGLockTimeoutError,
+    status_manager,
 )
+from ..playgroundtools.locks import lock_collector, lock_playground, lock_trash
+from ..playgroundtools.playground import clean_config
 from ..playgroundtools.resources import load_file_resource
-from .fixtures import raw_config
+from .fixtures import data_dir, raw_config
 
 
 class TestPGCommands:
@@ -93,6 +102,319 @@ class TestPGCommands:
             commands.new(args)
         assert err.value.args[0] == args.type
 
+    def test_new_batch(self, tmp_path):
+        entries = [
+            {"name": str(tmp_path / "test"), "type": "console"},
+            {"name": str(tmp_path / "invalid"), "type": "test"},
+            {"type": "console"},
+        ]
+
+        results = commands.new_batch(entries, max_workers=2)
+
+        assert [result["success"] for result in results] == [
+            True,
+            False,
+            False,
+        ]
+        assert (tmp_path / "test" / "main.py").exists()
+        assert not (tmp_path / "invalid").exists()
+
+    def test_new_manifest(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        entries = [
+            {
+                "name": str(tmp_path / "test"),
+                "type": "console",
+                "lib": [],
+                "options": {},
+            }
+        ]
+        manifest.write_text(json.dumps(entries))
+        args = Namespace(
+            command="new",
+            name=None,
+            type=None,
+            lib=[],
+            verbose=0,
+            options=None,
+            manifest=str(manifest),
+            jobs=1,
+        )
+
+        results = commands.new(args)
+
+        assert results[0]["success"]
+        assert (tmp_path / "test" / "settings.json").exists()
+
+    @pytest.mark.parametrize(
+        "entries",
+        [
+            {"name": "test"},
+            ["test"],
+            [{"name": "test", "lib": "requests"}],
+            [{"name": ["test"]}],
+        ],
+    )
+    def test_new_manifest_invalid(self, tmp_path, entries):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps(entries))
+        args = Namespace(command="new", verbose=0, manifest=str(manifest))
+
+        with pytest.raises(PGInvalidManifestError):
+            commands.new(args)
+
+    @pytest.mark.parametrize(
+        "options", [{"jobs": 0}, {"update": True}, {"trace": "trace.json"}]
+    )
+    def test_new_manifest_options(self, tmp_path, options):
+        args = Namespace(
+            command="new", verbose=0, manifest="manifest.json", **options
+        )
+
+        with pytest.raises(PGInvalidOptionError):
+            commands.new(args)
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Replaces creating virtual environments and installing packages."""
+        calls = []
+
+        def new_venv(playground_dir, *args):
+            python_path = playground_dir / ".venv" / "bin" / "python"
+            python_path.parent.mkdir(parents=True)
+            python_path.touch()
+            calls.append("venv")
+
+        monkeypatch.setattr(commands, "new_venv", new_venv)
+        monkeypatch.setattr(
+            commands, "install_reqs", lambda *args: calls.append("reqs")
+        )
+        return calls
+
+    def test_new_staging(self, tmp_path, calls):
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        (playground_dir / "old.py").touch()
+
+        commands.new(args)
+
+        assert not (tmp_path / ".test.staging").exists()
+        assert not (playground_dir / "old.py").exists()
+        settings = json.loads((playground_dir / "settings.json").read_text())
+        assert settings["python"] == str(playground_dir / ".venv/bin/python")
+
+    def test_new_trace(self, tmp_path, calls):
+        trace_path = tmp_path / "trace.json"
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=2,
+            options=None,
+            trace=str(trace_path),
+        )
+
+        commands.new(args)
+
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        spans = {
+            event["name"]: event for event in events if event["ph"] == "X"
+        }
+        for name in ["new", "files", "venv", "reqs", "commit", "main.py"]:
+            assert spans[name]["dur"] >= 0
+        assert spans["main.py"]["cat"] == "file"
+        assert spans["files"]["args"]["bytes"] > 0
+
+    def test_new_link(self, tmp_path, calls):
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=0,
+            options=None,
+            link=True,
+        )
+        commands.new(args)
+        args.name = str(tmp_path / "other")
+        commands.new(args)
+
+        main_path = tmp_path / "test" / "main.py"
+        other_path = tmp_path / "other" / "main.py"
+        assert main_path.read_text() == "print('Hello, World!')\n"
+        with open(main_path, "a") as f:
+            f.write("# Edited\n")
+        assert other_path.read_text() == "print('Hello, World!')\n"
+
+        config = clean_config(
+            args,
+            {
+                "console": {
+                    "folders": [],
+                    "files": {"main.py": ["print('Updated')"]},
+                    "lib": [],
+                    "module": "main",
+                    "args": [],
+                }
+            },
+        )
+        commands.update_playground(config, link=True)
+        assert other_path.read_text() == "print('Updated')\n"
+        assert main_path.read_text() == "print('Hello, World!')\n# Edited\n"
+
+    def test_new_staging_error(self, tmp_path, calls, monkeypatch):
+        def install_reqs(*args):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(commands, "install_reqs", install_reqs)
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        (playground_dir / "old.py").touch()
+
+        with status_manager(args):
+            commands.new(args)
+
+        assert not (tmp_path / ".test.staging").exists()
+        assert (playground_dir / "old.py").exists()
+
+    def test_new_staging_locked(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PLAYGROUNDTOOLS_LOCK_TIMEOUT", "0.05")
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        # Another process is building the playground
+        staging_dir = tmp_path / ".test.staging"
+        staging_dir.mkdir()
+
+        with lock_playground(tmp_path / "test"):
+            with status_manager(args):
+                commands.new(args)
+
+        assert staging_dir.exists()
+
+    def test_new_update(self, tmp_path, calls):
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="test",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        type_config = {
+            "folders": ["src", "old"],
+            "files": {
+                "src/main.py": ["print('Hello, World!')"],
+                "old.py": [],
+                "src/keep.py": [],
+            },
+            "lib": [],
+            "module": "main",
+            "args": [],
+        }
+        config = clean_config(args, {"test": type_config})
+        commands.create_playground(config)
+        playground_dir = config["dir"]
+        keep_path = playground_dir / "src" / "keep.py"
+        os.utime(keep_path, (0, 0))
+        assert calls == ["venv", "reqs"]
+
+        type_config = deepcopy(type_config)
+        del type_config["files"]["old.py"]
+        type_config["folders"].remove("old")
+        type_config["files"]["src/main.py"] = ["print('Updated')"]
+        config = clean_config(args, {"test": type_config})
+        commands.update_playground(config)
+
+        assert not (playground_dir / "old.py").exists()
+        assert not (playground_dir / "old").exists()
+        main_path = playground_dir / "src" / "main.py"
+        assert main_path.read_text() == "print('Updated')\n"
+        assert keep_path.stat().st_mtime == 0
+        assert calls == ["venv", "reqs"]
+
+        args.lib = ["requests"]
+        config = clean_config(args, {"test": type_config})
+        commands.update_playground(config)
+        assert calls == ["venv", "reqs", "reqs"]
+
+    def test_list(self, tmp_path, calls):
+        args = Namespace(
+            command="new",
+            name=str(tmp_path / "test"),
+            type="console",
+            lib=[],
+            verbose=0,
+            options=None,
+        )
+        commands.new(args)
+        args = Namespace(
+            command="list",
+            type="console",
+            name=None,
+            sort="name",
+            reverse=False,
+            json=False,
+        )
+
+        (playground,) = commands.list_playgrounds(args)
+        assert playground["path"] == str(tmp_path / "test")
+        assert playground["type"] == "console"
+        assert playground["size"] > 0
+
+        commands.delete(
+            Namespace(command="delete", name=str(tmp_path / "test"))
+        )
+        assert commands.list_playgrounds(args) == []
+
+    def test_delete_locked(self, tmp_path, monkeypatch):
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        monkeypatch.setenv("PLAYGROUNDTOOLS_LOCK_TIMEOUT", "0.05")
+        args = Namespace(command="delete", name=str(playground_dir))
+
+        with lock_playground(playground_dir):
+            with pytest.raises(PGLockTimeoutError):
+                commands.delete(args)
+            assert playground_dir.exists()
+
+            args = Namespace(command="gc")
+            with lock_collector():
+                assert commands.gc(args) == 0
+
+    def test_delete_trash_locked(self, tmp_path, monkeypatch):
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        monkeypatch.setenv("PLAYGROUNDTOOLS_LOCK_TIMEOUT", "0.05")
+        args = Namespace(command="delete", name=str(playground_dir))
+
+        with lock_trash():
+            with pytest.raises(PGLockTimeoutError):
+                commands.delete(args)
+            assert playground_dir.exists()
+
     def test_run(self, existing_playground, tmp_path, request):
         args = Namespace(command="run", name="test", module=None, args=[])
         path = tmp_path / args.name
@@ -103,6 +425,90 @@ class TestPGCommands:
         finally:
             os.chdir(request.config.invocation_dir)
 
+    def test_run_exit_code(self, tmp_path):
+        playground_dir = tmp_path / "test playground"
+        playground_dir.mkdir()
+        (playground_dir / "main.py").write_text("raise SystemExit(3)\n")
+        settings = {"python": sys.executable, "module": "main", "args": []}
+        (playground_dir / "settings.json").write_text(json.dumps(settings))
+        args = Namespace(
+            command="run", name=str(playground_dir), module=None, args=[]
+        )
+
+        assert commands.run(args) == 3
+
+    def test_run_repeat(self, tmp_path, capsys):
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        (playground_dir / "main.py").write_text("print('output')\n")
+        settings = {"python": sys.executable, "module": "main", "args": []}
+        (playground_dir / "settings.json").write_text(json.dumps(settings))
+        args = Namespace(
+            command="run",
+            name=str(playground_dir),
+            module=None,
+            args=[],
+            repeat=3,
+            warmup=1,
+            json=True,
+        )
+
+        results = commands.run(args)
+        assert len(results["runs"]) == 3
+        assert results["summary"]["wall"]["min"] > 0
+
+        captured = capsys.readouterr()
+        assert json.loads(captured.out)["repeat"] == 3
+
+    @pytest.mark.parametrize(
+        "mode,suffix", [("cpu", ".prof"), ("memory", ".tracemalloc")]
+    )
+    def test_run_profile(self, tmp_path, capfd, mode, suffix):
+        playground_dir = tmp_path / "test"
+        playground_dir.mkdir()
+        (playground_dir / "helper.py").write_text("VALUE = 2\n")
+        main_text = "import helper\ndata = [0] * 10000\nraise SystemExit(3)\n"
+        (playground_dir / "main.py").write_text(main_text)
+        settings = {"python": sys.executable, "module": "main", "args": []}
+        (playground_dir / "settings.json").write_text(json.dumps(settings))
+        args = Namespace(
+            command="run",
+            name=str(playground_dir),
+            module=None,
+            args=[],
+            profile=mode,
+            top=5,
+        )
+
+        assert commands.run(args) == 3
+        (profile_path,) = (playground_dir / "profiles").iterdir()
+        assert profile_path.suffix == suffix
+        assert str(profile_path) in capfd.readouterr().err
+
+    @pytest.mark.skipif(os.name == "nt", reason="requires os.fork")
+    def test_run_exec(self, tmp_path):
+        playground_dir = tmp_path / "test playground"
+        playground_dir.mkdir()
+        (playground_dir / "main.py").write_text("raise SystemExit(3)\n")
+        settings = {"python": sys.executable, "module": "main", "args": []}
+        (playground_dir / "settings.json").write_text(json.dumps(settings))
+        args = Namespace(
+            command="run",
+            name=str(playground_dir),
+            module=None,
+            args=[],
+            exec=True,
+        )
+
+        pid = os.fork()
+        if not pid:
+            try:
+                commands.run(args)
+            finally:
+                os._exit(1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 3
+
     def test_run_invalid(self, tmp_path):
         args = Namespace(command="run", name="test", module=None, args=[])
         path = tmp_path / args.name
@@ -120,6 +526,22 @@ class TestPGCommands:
 
         assert not path.exists()
 
+    def test_delete_many(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        for name in ["first", "second", "other"]:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "settings.json").touch()
+        (tmp_path / "folder").mkdir()
+        args = Namespace(
+            command="delete", name=["*s*", "folder", "first"], wait=True
+        )
+
+        commands.delete(args)
+
+        remaining = [path.name for path in tmp_path.iterdir()]
+        assert sorted(remaining) == ["data", "other"]
+        assert registry.get_trash() == []
+
     def test_delete_invalid(self, tmp_path):
         args = Namespace(command="run", name="test")
         path = tmp_path / args.name
@@ -152,12 +574,105 @@ class TestConfCommands:
         args = Namespace(command="config", subcommand=None, read="api.files")
         assert commands.config(args) == raw_config["api"]["files"]
 
+    def test_config_read_wildcard(self, raw_config):
+        args = Namespace(command="config", subcommand=None, read="*.module")
+        assert commands.config(args) == {
+            f"{type}.module": type_config["module"]
+            for type, type_config in raw_config.items()
+        }
+
     def test_config_invalid(self, raw_config):
         args = Namespace(command="config", subcommand=None, read="test")
 
         with pytest.raises(PGInvalidConfError):
             commands.config(args)
 
+    def test_config_migrate(self, raw_config, data_dir):
+        args = Namespace(command="config", subcommand="migrate", dir=None)
+        commands.config(args)
+
+        config_dir = data_dir / "config"
+        assert (config_dir / "types" / "api.json").exists()
+        # Only the type being read is loaded
+        (config_dir / "types" / "jupyter.json").write_text("{")
+        args = Namespace(command="config", subcommand=None, read="api.files")
+        assert commands.config(args) == raw_config["api"]["files"]
+
+        args = Namespace(
+            command="config",
+            subcommand="set",
+            key="api.module",
+            value='"server"',
+            file=None,
+        )
+        commands.config(args)
+        api_config = json.loads(
+            (config_dir / "types" / "api.json").read_text()
+        )
+        assert api_config["module"] == "server"
+        with load_file_resource("config.json") as config_path:
+            assert json.loads(config_path.read_text()) == raw_config
+
+    def test_config_apply(self, raw_config, tmp_path):
+        edits = [
+            {"op": "set", "key": "api.module", "value": "server"},
+            {"op": "add", "path": "/api/format", "value": {"port": "80"}},
+            {"op": "delete", "key": "jupyter"},
+            {"op": "remove", "path": "/console/args"},
+        ]
+        edits_path = tmp_path / "edits.json"
+        edits_path.write_text(json.dumps(edits))
+        args = Namespace(command="config", subcommand="apply", file=edits_path)
+
+        config = commands.config(args)
+        assert config["api"]["module"] == "server"
+        assert config["api"]["format"] == {"port": "80"}
+        assert "jupyter" not in config
+        assert "args" not in config["console"]
+        with load_file_resource("config.json") as config_path:
+            assert json.loads(config_path.read_text()) == config
+
+    def test_config_apply_list(self, raw_config, tmp_path):
+        lib = raw_config["api"]["lib"]
+        edits = [
+            {"op": "add", "path": "/api/lib/0", "value": "requests"},
+            {"op": "add", "path": "/api/lib/-", "value": "httpx"},
+        ]
+        edits_path = tmp_path / "edits.json"
+        edits_path.write_text(json.dumps(edits))
+        args = Namespace(command="config", subcommand="apply", file=edits_path)
+
+        config = commands.config(args)
+        assert config["api"]["lib"] == ["requests", *lib, "httpx"]
+
+    @pytest.mark.parametrize(
+        "edit",
+        [
+            {"op": "replace", "path": "/api/missing", "value": "main"},
+            {"op": "remove", "path": "/api/lib/99"},
+        ],
+    )
+    def test_config_apply_missing(self, raw_config, tmp_path, edit):
+        edits_path = tmp_path / "edits.json"
+        edits_path.write_text(json.dumps([edit]))
+        args = Namespace(command="config", subcommand="apply", file=edits_path)
+
+        with pytest.raises(PGInvalidConfError):
+            commands.config(args)
+
+    def test_config_apply_invalid(self, raw_config, monkeypatch):
+        edits = [
+            {"op": "set", "key": "api.module", "value": "server"},
+            {"op": "set", "key": "missing.module", "value": "main"},
+        ]
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(edits)))
+        args = Namespace(command="config", subcommand="apply", file="-")
+
+        with pytest.raises(PGInvalidConfError):
+            commands.config(args)
+        with load_file_resource("config.json") as config_path:
+            assert json.loads(config_path.read_text()) == raw_config
+
     def test_config_delete(self, raw_config, example_type):
         modified_config = {**raw_config, **example_type}
         with load_file_resource("config.json") as config_path:
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from ..playgroundtools import configdir
+from ..playgroundtools.exceptions import PGJSONFormatError
+
+
+class TestConfigDir:
+    """Tests functions in the configdir module."""
+
+    @pytest.fixture
+    def config_dir(self, tmp_path):
+        config_dir = tmp_path / "config"
+        config = {
+            "console": {"files": {"main.py": ["print('Hello')"]}},
+            "api/v2": {"files": {}},
+        }
+        configdir.write_config_dir(config, config_dir)
+        return config_dir
+
+    def test_write_config_dir(self, config_dir):
+        index = json.loads((config_dir / "index.json").read_text())
+        assert index["types"] == {
+            "console": "types/console.json",
+            "api/v2": "types/api%2Fv2.json",
+        }
+        assert configdir.is_config_dir(config_dir)
+
+    def test_lazy_config(self, config_dir):
+        (config_dir / "types" / "api%2Fv2.json").write_text("{")
+        config = configdir.LazyConfig(config_dir)
+
+        assert list(config) == ["console", "api/v2"]
+        assert config["console"]["files"]["main.py"] == ["print('Hello')"]
+        with pytest.raises(PGJSONFormatError):
+            config["api/v2"]
+        with pytest.raises(KeyError):
+            config["missing"]
+
+    def test_lazy_config_save(self, config_dir):
+        config = configdir.LazyConfig(config_dir)
+        config["console"]["module"] = "main"
+        config["new"] = {"files": {}}
+        del config["api/v2"]
+        config.save()
+
+        config = configdir.LazyConfig(config_dir)
+        assert dict(config) == {
+            "console": {
+                "files": {"main.py": ["print('Hello')"]},
+                "module": "main",
+            },
+            "new": {"files": {}},
+        }
+        assert not (config_dir / "types" / "api%2Fv2.json").exists()
@@ -0,0 +1,70 @@
+import queue
+from argparse import Namespace
+
+from ..playgroundtools import gui
+from ..playgroundtools.exceptions import PGDoesNotExistError
+from ..playgroundtools.views import directory, file
+
+
+class TestGui:
+    """Tests the functions which run commands for the GUI."""
+
+    def get_messages(self, jobs):
+        messages = []
+        while not jobs.empty():
+            messages.append(jobs.get_nowait())
+        return messages
+
+    def test_run_job(self):
+        def func(args, output):
+            gui.set_status("Working...", output)
+
+        jobs = queue.Queue()
+        gui.run_job(Namespace(command="new", name=None, func=func), jobs)
+        assert self.get_messages(jobs) == [
+            ("status", "Working..."),
+            ("done", None),
+        ]
+
+    def test_run_job_error(self):
+        def func(args, output):
+            raise PGDoesNotExistError("test")
+
+        jobs = queue.Queue()
+        gui.run_job(Namespace(command="delete", name="test", func=func), jobs)
+        assert self.get_messages(jobs) == [
+            ("error", "The playground 'test' does not exist.")
+        ]
+
+
+class TestDirectoryView:
+    """Tests the building of the directory preview's tree."""
+
+    def test_build_tree(self):
+        paths = ["src/b/main.py", "src", "a/b", "README.md", "src/a.py"]
+        assert directory.build_tree(paths) == {
+            "": ["README.md", "a", "src"],
+            "README.md": [],
+            "a": ["a/b"],
+            "a/b": [],
+            "src": ["src/a.py", "src/b"],
+            "src/a.py": [],
+            "src/b": ["src/b/main.py"],
+            "src/b/main.py": [],
+        }
+
+    def test_build_tree_parents(self):
+        tree = directory.build_tree(["b/main.py", "a/main.py", "./c"])
+        assert list(tree) == ["", "a", "a/main.py", "b", "b/main.py", "c"]
+
+
+class TestFileView:
+    """Tests the splitting of file previews into chunks."""
+
+    def test_iter_chunks(self):
+        text = "abcdefghij"
+        assert list(file.iter_chunks(text, 4)) == ["abcd", "efgh", "ij"]
+        assert "".join(file.iter_chunks(text, 3)) == text
+
+    def test_iter_chunks_empty(self):
+        assert list(file.iter_chunks("", 4)) == []
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from ..playgroundtools import locks
+from ..playgroundtools.exceptions import PGInvalidEnvError, PGLockTimeoutError
+from .fixtures import data_dir
+
+
+class TestLocks:
+    """Tests functions in the locks module."""
+
+    def test_lock_timeout(self, tmp_path):
+        with locks.lock_playground(tmp_path / "test"):
+            with pytest.raises(PGLockTimeoutError) as err:
+                with locks.lock_playground(tmp_path / "test", timeout=0.05):
+                    pass
+            assert str(tmp_path / "test") in err.value.args[0]
+
+            with locks.lock_playground(tmp_path / "other", timeout=0):
+                pass
+
+    def test_lock_wait(self, data_dir):
+        events = []
+
+        def hold():
+            with locks.lock("test"):
+                events.append("locked")
+                time.sleep(0.2)
+                events.append("unlocked")
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        while not events:
+            time.sleep(0.01)
+        with locks.lock("test", timeout=5):
+            events.append("acquired")
+        thread.join()
+
+        assert events == ["locked", "unlocked", "acquired"]
+        assert (data_dir / "locks" / "test.lock").exists()
+
+    @pytest.mark.parametrize("timeout", ["abc", "-1", "nan"])
+    def test_get_lock_timeout_invalid(self, monkeypatch, timeout):
+        monkeypatch.setenv(locks.LOCK_TIMEOUT_ENV, timeout)
+        with pytest.raises(PGInvalidEnvError):
+            locks.get_lock_timeout()
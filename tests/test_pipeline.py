@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from ..playgroundtools import pipeline
+
+
+class TestPipeline:
+    """Tests functions in the pipeline module."""
+
+    def test_run_stages(self):
+        order = []
+        stages = [
+            pipeline.Stage("c", lambda: order.append("c"), requires=["b"]),
+            pipeline.Stage("b", lambda: order.append("b"), requires=["a"]),
+            pipeline.Stage("a", lambda: order.append("a") or "result"),
+        ]
+
+        results = pipeline.run_stages(stages)
+        assert order == ["a", "b", "c"]
+        assert results["a"] == "result"
+
+    def test_run_stages_concurrent(self):
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [
+            pipeline.Stage("a", barrier.wait),
+            pipeline.Stage("b", barrier.wait),
+        ]
+
+        pipeline.run_stages(stages, max_workers=2)
+
+    def test_run_stages_error(self):
+        order = []
+
+        def fail():
+            raise RuntimeError("failed")
+
+        stages = [
+            pipeline.Stage("a", fail),
+            pipeline.Stage("b", lambda: order.append("b"), requires=["a"]),
+        ]
+
+        with pytest.raises(RuntimeError):
+            pipeline.run_stages(stages)
+        assert not order
+
+    @pytest.mark.parametrize(
+        "stages",
+        [
+            [pipeline.Stage("a", print, requires=["b"])],
+            [
+                pipeline.Stage("a", print, requires=["b"]),
+                pipeline.Stage("b", print, requires=["a"]),
+            ],
+        ],
+    )
+    def test_run_stages_invalid(self, stages):
+        with pytest.raises(ValueError):
+            pipeline.run_stages(stages)
@@ -1,4 +1,5 @@
 import json
+import os
 from argparse import Namespace
 from pathlib import Path
 
@@ -11,7 +12,7 @@ from ..playgroundtools.exceptions import (
     PGInvalidConfError,
 )
 from ..playgroundtools.resources import load_file_resource
-from .fixtures import raw_config
+from .fixtures import data_dir, raw_config
 
 
 class TestPlayground:
@@ -120,6 +121,43 @@ class TestPlayground:
                 playground.get_config()
             config_path.touch()
 
+    def test_get_config_cached(self, raw_config):
+        with load_file_resource("config.json") as config_path:
+            stat = config_path.stat()
+            key = (str(config_path), stat.st_mtime_ns, stat.st_size)
+        cache_path = playground.get_config_cache_path()
+        cached_at = stat.st_mtime_ns + 2 * playground.RACY_TIME
+        cached = (key, b"", cached_at, {"cached": {}})
+        playground.write_config_cache(cache_path, cached)
+
+        assert playground.get_config() == {"cached": {}}
+
+    def test_get_config_modified(self, raw_config):
+        assert playground.get_config() == raw_config
+        assert playground.get_config_cache_path().exists()
+
+        with load_file_resource("config.json") as config_path:
+            stat = config_path.stat()
+            content = config_path.read_text()
+            config_path.write_text(content.replace("Hello", "Howdy"))
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        config = playground.get_config()
+        assert config["console"]["files"]["main.py"] == [
+            "print('Howdy, World!')"
+        ]
+
+    def test_get_config_env(self, tmp_path, monkeypatch):
+        config_path = tmp_path / "config.json"
+        config_path.write_text('{"custom": {}}')
+        monkeypatch.setenv(playground.CONFIG_ENV, str(config_path))
+
+        assert playground.get_config() == {"custom": {}}
+        playground.set_config({"custom": {"module": "main"}})
+        assert json.loads(config_path.read_text()) == {
+            "custom": {"module": "main"}
+        }
+
     @pytest.mark.parametrize(
         ["args", "clean_config"],
         [
@@ -239,6 +277,32 @@ class TestPlayground:
         cleaned = playground.clean_config(args, config)
         assert sorted(cleaned) == sorted(example_interpolated)
 
+    def test_format_config_values(self, example_type, raw_config):
+        config = {**raw_config, **example_type}
+        args = Namespace(
+            command="new",
+            name="playground",
+            type="package",
+            lib=["${name}-extras"],
+            verbose=1,
+            options='{"formatter": "yapf"}',
+        )
+
+        cleaned = playground.clean_config(args, config)
+        assert cleaned["folders"] == ["playground", "tests", "requirements"]
+        assert cleaned["files"]["setup.cfg"][1] == "name = playground"
+        assert "playground/__init__.py" in cleaned["files"]
+        assert cleaned["lib"] == [
+            "playground",
+            "yapf",
+            "flake8",
+            "build",
+            "twine",
+            "isort",
+            "playground-extras",
+        ]
+        assert cleaned["settings"]["module"] == "playground"
+
     def test_clean_config_invalid(self, raw_config):
         modified_config = raw_config
         del modified_config["http"]["folders"]
@@ -0,0 +1,104 @@
+import pytest
+
+from ..playgroundtools import query
+
+
+class TestQuery:
+    """Tests functions in the query module."""
+
+    @pytest.fixture
+    def config(self):
+        return {
+            "api": {
+                "lib": ["fastapi", "uvicorn"],
+                "files": {"main.py": ["import api"]},
+            },
+            "db": {"lib": ["sqlalchemy"], "files": {}},
+            "console": {"lib": [], "files": {}},
+        }
+
+    @pytest.mark.parametrize(
+        ["path", "segments"],
+        [
+            ("api", (("key", "api"),)),
+            ("api.lib[0]", (("key", "api"), ("key", "lib"), ("index", 0))),
+            ("*.lib[-1]", (("wildcard", None), ("key", "lib"), ("index", -1))),
+            ("a\\.b.c\\*", (("key", "a.b"), ("key", "c*"))),
+            (
+                "api.lib[*]",
+                (("key", "api"), ("key", "lib"), ("wildcard", None)),
+            ),
+        ],
+    )
+    def test_compile_path(self, path, segments):
+        assert query.compile_path(path) == segments
+
+    @pytest.mark.parametrize(
+        "path", ["", "api.", ".api", "a..b", "a[x]", "a[0]b"]
+    )
+    def test_compile_path_invalid(self, path):
+        with pytest.raises(ValueError):
+            query.compile_path(path)
+
+    def test_query(self, config):
+        assert query.query("api.files.main\\.py", config) == ["import api"]
+        assert query.query("api.lib[-1]", config) == "uvicorn"
+        assert query.query("*.lib[0]", config) == {
+            "api.lib[0]": "fastapi",
+            "db.lib[0]": "sqlalchemy",
+        }
+        with pytest.raises(KeyError):
+            query.query("api.lib[2]", config)
+
+    def test_set_path(self, config):
+        assert query.set_path("*.module", "main", config) == 3
+        assert query.set_path("api.lib[1]", "hypercorn", config) == 1
+        assert config["db"]["module"] == "main"
+        assert config["api"]["lib"] == ["fastapi", "hypercorn"]
+        with pytest.raises(KeyError):
+            query.set_path("api.lib[2]", "gunicorn", config)
+
+    def test_delete_path(self, config):
+        assert query.delete_path("*.lib[*]", config) == 3
+        assert query.delete_path("api.files.main\\.py", config) == 1
+        assert config["api"] == {"lib": [], "files": {}}
+        with pytest.raises(KeyError):
+            query.delete_path("api.module", config)
+
+    def test_format_path(self):
+        keys = ["api", "files", "main.py", 0]
+        assert query.format_path(keys) == "api.files.main\\.py[0]"
+
+    def test_patch(self, config):
+        query.patch("/api/lib/0", "add", "requests", config)
+        query.patch("/api/lib/-", "add", "gunicorn", config)
+        query.patch("/api/lib/1", "replace", "starlette", config)
+        query.patch("/api/files/main.py", "remove", None, config)
+        query.patch("/api/module~1name", "add", "main", config)
+        assert config["api"]["lib"] == [
+            "requests",
+            "starlette",
+            "uvicorn",
+            "gunicorn",
+        ]
+        assert config["api"]["files"] == {}
+        assert config["api"]["module/name"] == "main"
+
+    @pytest.mark.parametrize(
+        ["pointer", "op"],
+        [
+            ("/api/missing", "replace"),
+            ("/api/missing", "remove"),
+            ("/api/lib/2", "replace"),
+            ("/api/lib/3", "add"),
+            ("/missing/lib", "add"),
+        ],
+    )
+    def test_patch_missing(self, config, pointer, op):
+        with pytest.raises(KeyError):
+            query.patch(pointer, op, "main", config)
+
+    @pytest.mark.parametrize("pointer", ["api", "", "/api/lib/01"])
+    def test_patch_invalid(self, config, pointer):
+        with pytest.raises(ValueError):
+            query.patch(pointer, "replace", "main", config)
@@ -0,0 +1,60 @@
+import pytest
+
+from ..playgroundtools import registry
+from .fixtures import data_dir
+
+
+class TestRegistry:
+    """Tests functions in the registry module."""
+
+    @pytest.fixture
+    def playgrounds(self, tmp_path):
+        playgrounds = {
+            "api_app": ("api", 300),
+            "console_app": ("console", 100),
+            "other_api": ("api", 200),
+        }
+        for name, (type, size) in playgrounds.items():
+            python = tmp_path / name / ".venv" / "bin" / "python"
+            registry.register(tmp_path / name, type, python, size)
+        return playgrounds
+
+    def test_get_playgrounds(self, playgrounds):
+        names = [pg["name"] for pg in registry.get_playgrounds()]
+        assert names == ["api_app", "console_app", "other_api"]
+
+    @pytest.mark.parametrize(
+        ["filters", "names"],
+        [
+            ({"type": "api"}, ["api_app", "other_api"]),
+            ({"name": "*_app"}, ["api_app", "console_app"]),
+            ({"type": "api", "name": "*_app"}, ["api_app"]),
+            ({"sort": "size"}, ["console_app", "other_api", "api_app"]),
+            (
+                {"sort": "size", "reverse": True},
+                ["api_app", "other_api", "console_app"],
+            ),
+        ],
+    )
+    def test_get_playgrounds_filtered(self, playgrounds, filters, names):
+        playgrounds = registry.get_playgrounds(**filters)
+        assert [pg["name"] for pg in playgrounds] == names
+
+    def test_register_existing(self, playgrounds, tmp_path):
+        (created,) = registry.get_playgrounds(name="api_app")
+        registry.touch(tmp_path / "api_app")
+        registry.register(tmp_path / "api_app", "api", "python", 500)
+
+        (playground,) = registry.get_playgrounds(name="api_app")
+        assert playground["created"] == created["created"]
+        assert playground["last_run"] is not None
+        assert playground["size"] == 500
+
+    def test_unregister(self, playgrounds, tmp_path):
+        registry.unregister(tmp_path / "api_app")
+        names = [pg["name"] for pg in registry.get_playgrounds()]
+        assert names == ["console_app", "other_api"]
+
+    def test_get_playgrounds_invalid(self):
+        with pytest.raises(ValueError):
+            registry.get_playgrounds(sort="name; DROP TABLE playgrounds")
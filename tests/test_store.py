@@ -0,0 +1,65 @@
+from ..playgroundtools import store
+from .fixtures import data_dir
+
+
+class TestStore:
+    """Tests functions in the store module."""
+
+    def test_add_blob(self):
+        blob_path = store.add_blob("print('Hello, World!')\n")
+
+        assert blob_path.read_text() == "print('Hello, World!')\n"
+        assert store.add_blob("print('Hello, World!')\n") == blob_path
+        assert store.add_blob("print('Goodbye!')\n") != blob_path
+
+    def test_link_blob(self, tmp_path):
+        blob_path = store.add_blob("print('Hello, World!')\n")
+        first_path = tmp_path / "first.py"
+        second_path = tmp_path / "second.py"
+
+        store.link_blob(blob_path, first_path)
+        store.link_blob(blob_path, second_path)
+        assert first_path.read_text() == "print('Hello, World!')\n"
+
+        with open(second_path, "a") as f:
+            f.write("print('Goodbye!')\n")
+        assert first_path.read_text() == "print('Hello, World!')\n"
+        assert blob_path.read_text() == "print('Hello, World!')\n"
+
+    def test_link_text_pruned(self, tmp_path, monkeypatch):
+        add_blob = store.add_blob
+
+        def add_pruned_blob(text, store_dir=None):
+            # Simulate a prune between adding and linking the blob
+            blob_path = add_blob(text, store_dir)
+            monkeypatch.setattr(store, "add_blob", add_blob)
+            blob_path.unlink()
+            return blob_path
+
+        monkeypatch.setattr(store, "can_reflink", lambda *args: True)
+        monkeypatch.setattr(store, "add_blob", add_pruned_blob)
+        store.link_text("print('Hello, World!')\n", tmp_path / "main.py")
+        assert (tmp_path / "main.py").read_text() == "print('Hello, World!')\n"
+
+    def test_link_text_direct(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(store, "can_reflink", lambda *args: False)
+        store.link_text("print('Hello, World!')\n", tmp_path / "main.py")
+
+        assert (tmp_path / "main.py").read_text() == "print('Hello, World!')\n"
+        assert not list(store.get_store_dir().glob("*/*"))
+
+    def test_can_reflink(self, tmp_path):
+        store_dir = store.get_store_dir()
+        supported = store.can_reflink(store_dir, tmp_path)
+
+        assert supported == store.probe_reflink(store_dir)
+        assert store.can_reflink(store_dir, tmp_path) == supported
+        assert list(store_dir.iterdir()) == []
+
+    def test_prune_store(self, tmp_path):
+        blob_path = store.add_blob("print('Hello, World!')\n")
+        store.link_blob(blob_path, tmp_path / "main.py")
+
+        assert store.prune_store() == 1
+        assert not blob_path.exists()
+        assert (tmp_path / "main.py").read_text() == "print('Hello, World!')\n"
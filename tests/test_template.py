@@ -0,0 +1,52 @@
+import pytest
+
+from ..playgroundtools import template
+
+
+class TestTemplate:
+    """Tests functions in the template module."""
+
+    @pytest.mark.parametrize(
+        ["unformatted", "formatted"],
+        [
+            ("${name}", "test"),
+            ("name = ${name}", "name = test"),
+            ("${name}/${author}.py", "test/John Doe.py"),
+            ("${missing}", "${missing}"),
+            ("$name {name}", "$name {name}"),
+            (
+                {"${name}/__init__.py": ["# ${author}", "", 1, None]},
+                {"test/__init__.py": ["# John Doe", "", 1, None]},
+            ),
+            (
+                [["${name}"], {"${name}": {"a": "${author}"}}],
+                [["test"], {"test": {"a": "John Doe"}}],
+            ),
+            (True, True),
+        ],
+    )
+    def test_render(self, unformatted, formatted):
+        format_map = {"name": "test", "author": "John Doe"}
+        rendered = template.Template(unformatted).render(format_map)
+        assert rendered == formatted
+
+    def test_render_copies(self):
+        unformatted = {"folders": ["tests"]}
+        rendered = template.Template(unformatted).render({})
+        rendered["folders"].append("docs")
+        assert unformatted == {"folders": ["tests"]}
+
+    def test_get_template(self):
+        unformatted = {"files": {"${name}.py": []}}
+        cached = template.get_template(unformatted)
+
+        assert template.get_template(unformatted) is cached
+        assert template.get_template(dict(unformatted)) is cached
+
+    def test_get_template_modified(self):
+        unformatted = {"files": {"${name}.py": []}}
+        template.get_template(unformatted)
+
+        unformatted["files"]["${name}.py"].append("${name}")
+        rendered = template.get_template(unformatted).render({"name": "a"})
+        assert rendered == {"files": {"a.py": ["a"]}}
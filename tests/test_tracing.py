@@ -0,0 +1,58 @@
+import json
+import threading
+
+from ..playgroundtools import tracing
+
+
+class TestTracing:
+    """Tests functions in the tracing module."""
+
+    def test_span(self):
+        tracing.start_tracing()
+        with tracing.span("outer"):
+            with tracing.span("inner", "file") as args:
+                data = [0] * 100000
+                args["bytes"] = 10
+            del data
+            tracing.annotate(bytes=20)
+        events = tracing.stop_tracing()
+
+        spans = {
+            event["name"]: event for event in events if event["ph"] == "X"
+        }
+        assert spans["inner"]["cat"] == "file"
+        assert spans["inner"]["args"]["bytes"] == 10
+        assert spans["outer"]["args"]["bytes"] == 20
+        assert spans["outer"]["dur"] >= spans["inner"]["dur"]
+        for name in ["inner", "outer"]:
+            assert spans[name]["args"]["memory_peak"] > 800000
+        assert not tracing.is_tracing()
+
+    def test_span_level(self):
+        tracing.start_tracing(level=1)
+        with tracing.span("detail", level=2) as args:
+            args["bytes"] = 10
+        events = tracing.stop_tracing()
+
+        assert not [event for event in events if event["ph"] == "X"]
+
+    def test_span_disabled(self):
+        with tracing.span("stage") as args:
+            tracing.annotate(bytes=10)
+        assert args == {}
+        assert tracing.stop_tracing() == []
+
+    def test_traced_threads(self, tmp_path):
+        tracing.start_tracing()
+        func = tracing.traced(lambda: None, "stage")
+        thread = threading.Thread(target=func, name="worker")
+        thread.start()
+        thread.join()
+        trace_path = tmp_path / "trace.json"
+        tracing.write_trace(trace_path, tracing.stop_tracing())
+
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        (stage,) = [event for event in events if event["ph"] == "X"]
+        (metadata,) = [event for event in events if event["ph"] == "M"]
+        assert stage["tid"] == metadata["tid"]
+        assert metadata["args"]["name"] == "worker"
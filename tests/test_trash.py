@@ -0,0 +1,60 @@
+from ..playgroundtools import registry, trash
+from .fixtures import data_dir
+
+
+class TestTrash:
+    """Tests functions in the trash module."""
+
+    def make_tree(self, folder, depth=3, width=3):
+        folder.mkdir()
+        for i in range(width):
+            (folder / f"file{i}.txt").write_text("test")
+            if depth:
+                self.make_tree(folder / f"folder{i}", depth - 1, width)
+        (folder / "link").symlink_to(folder.parent)
+
+    def test_move_to_trash(self, tmp_path):
+        folder = tmp_path / "test"
+        self.make_tree(folder, depth=1)
+
+        trash_path = trash.move_to_trash(folder)
+        assert not folder.exists()
+        assert trash_path.parent == tmp_path / trash.TRASH_NAME
+        assert registry.get_trash() == [str(trash_path.parent)]
+
+    def test_move_to_trash_collected(self, tmp_path, monkeypatch):
+        folder = tmp_path / "test"
+        self.make_tree(folder, depth=1)
+        calls = []
+
+        def add_trash(trash_dir):
+            registry.add_trash(trash_dir)
+            if not calls:
+                # Simulate a collector removing the empty trash directory
+                trash_dir.rmdir()
+                registry.remove_trash(trash_dir)
+            calls.append(trash_dir)
+
+        monkeypatch.setattr(trash, "add_trash", add_trash)
+        trash_path = trash.move_to_trash(folder)
+        assert len(calls) == 2
+        assert trash_path.exists()
+        assert registry.get_trash() == [str(trash_path.parent)]
+
+    def test_reap(self, tmp_path):
+        folder = tmp_path / "test"
+        self.make_tree(folder)
+
+        trash.reap(folder)
+        assert not folder.exists()
+        assert tmp_path.exists()
+
+    def test_collect_garbage(self, tmp_path):
+        for name in ["first", "second"]:
+            folder = tmp_path / name
+            self.make_tree(folder, depth=1)
+            trash.move_to_trash(folder)
+
+        assert trash.collect_garbage() == 2
+        assert not (tmp_path / trash.TRASH_NAME).exists()
+        assert registry.get_trash() == []
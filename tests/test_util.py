@@ -38,37 +38,26 @@ class TestUtil:
         assert util.get_venv_dir(playground_dir) == venv_path
 
     @pytest.mark.parametrize(
-        ["python", "module", "args", "cmd"],
+        ["python", "module", "args", "argv"],
         [
-            (
-                "test/.venv/Scripts/python",
-                "main",
-                [],
-                f"{Path('test/.venv/Scripts/python').resolve()} -m main",
-            ),
+            ("test/.venv/Scripts/python", "main", [], ["-m", "main"]),
             (
                 "test/.venv/Scripts/python",
                 "uvicorn",
                 ["main:app", "--reload"],
-                (
-                    f"{Path('test/.venv/Scripts/python').resolve()} -m"
-                    f" uvicorn main:app --reload"
-                ),
+                ["-m", "uvicorn", "main:app", "--reload"],
             ),
             (
-                "../parent_dir/.venv/Scripts/python",
+                "../parent dir/.venv/Scripts/python",
                 "jupyter",
                 ["notebook", "analysis.ipynb"],
-                (
-                    f"{Path('../parent_dir/.venv/Scripts/python').resolve()} "
-                    f"-m jupyter notebook analysis.ipynb"
-                ),
+                ["-m", "jupyter", "notebook", "analysis.ipynb"],
             ),
         ],
     )
-    def test_get_command(self, python, module, args, cmd):
+    def test_get_argv(self, python, module, args, argv):
         python = Path(python).resolve()
-        assert util.get_command(python, module, args) == cmd
+        assert util.get_argv(python, module, args) == [str(python), *argv]
 
     @pytest.mark.parametrize(
         ["folder", "exists"],
@@ -88,3 +77,13 @@ class TestUtil:
             folder_path.mkdir(parents=True)
         util.remove_if_exists(folder_path)
         assert not folder_path.exists()
+
+    def test_write_atomic(self, tmp_path):
+        file_path = tmp_path / "config.json"
+        file_path.write_text("old")
+        file_path.chmod(0o640)
+
+        util.write_atomic(file_path, "new")
+        assert file_path.read_text() == "new"
+        assert file_path.stat().st_mode & 0o777 == 0o640
+        assert list(tmp_path.iterdir()) == [file_path]
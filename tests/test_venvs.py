@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+import pytest
+
+from ..playgroundtools import venvs
+from .fixtures import data_dir
+
+
+@pytest.mark.skipif(
+    os.name == "nt", reason="templates are not used on Windows"
+)
+class TestVenvs:
+    """Tests functions in the venvs module."""
+
+    def test_create_venv(self, tmp_path):
+        venv_path = tmp_path / "test" / ".venv"
+        venvs.create_venv(venv_path)
+
+        template_path = venvs.get_template_dir() / ".venv"
+        assert venvs.is_template_valid(template_path)
+
+        pip_path = venv_path / "bin" / "pip"
+        assert pip_path.read_text().startswith(f"#!{venv_path}/bin/python")
+        assert str(template_path) not in (venv_path / "pyvenv.cfg").read_text()
+
+        template_pip_path = template_path / "bin" / "pip"
+        assert str(template_path) in template_pip_path.read_text()
+        assert f".{os.getpid()}" not in template_pip_path.read_text()
+
+    def test_create_venv_stale(self, tmp_path):
+        template_path = venvs.get_template()
+        cfg_path = template_path / "pyvenv.cfg"
+        cfg_path.write_text("version = 0.0.0\n")
+        assert not venvs.is_template_valid(template_path)
+
+        venvs.create_venv(tmp_path / "test" / ".venv")
+        assert venvs.is_template_valid(template_path)
+
+    def test_create_venv_space(self, tmp_path):
+        venv_path = tmp_path / "p one" / ".venv"
+        venvs.create_venv(venv_path)
+
+        pip_path = venv_path / "bin" / "pip"
+        assert pip_path.read_text().startswith("#!/bin/sh\n")
+        result = subprocess.run([pip_path, "--version"], capture_output=True)
+        assert result.returncode == 0
+
+    def test_relocate_script(self):
+        body = b"import sys\n"
+        content = venvs.get_shebang(b"/old/bin/python") + body
+        long_path = b"/" + b"x" * venvs.MAX_SHEBANG
+
+        relocated = venvs.relocate_script(content, b"/old", long_path)
+        assert venvs.parse_shebang(relocated) == (
+            long_path + b"/bin/python",
+            body,
+        )
+        assert venvs.relocate_script(relocated, long_path, b"/new") == (
+            b"#!/new/bin/python\n" + body
+        )